@@ -1,15 +1,38 @@
 import random
 import copy
-from collections import defaultdict
+from NonDominatedSort import non_dominated_sort
+import numpy as np
+from Population import Population
+from Hypervolume import hypervolume_2d, hv_truncate_2d
+from CrowdingDistance import crowding_order
 
 class ArchiveManager:
     """
-    管理非支配解存档，支持多层次fronts管理（Fast Non-dominated Sort）
+    管理非支配解存档，支持多层次fronts管理（双目标非支配排序，见 NonDominatedSort）
+    update() 时把存档与新个体复制进结构数组 self.population（Population：costs 为 (N, 2) 数组，
+    positions 为节点编号矩阵），按 fronts 顺序排列；archive / fronts 中的狼是其只读视图（WolfView），
+    种群后续修改 Position 不会影响存档。fronts 每次发生变化时 version 加一，
+    get_fronts_snapshot() 返回对应版本的只读快照，可在整代内直接引用而无需深拷贝；
+    get_front_costs() 返回与快照逐层对齐的 (n, 2) 目标值数组（population.costs 的行切片）。
+    拥挤距离、超体积裁剪与 HV 计算都直接在这些数组上进行，不逐只读取 wolf.Cost。
+    第一层超过 archive_size 时的裁剪方式（truncation）：
+    - 'crowding'：按拥挤距离保留（默认）
+    - 'hv'：逐个删除相对 reference_point 超体积贡献最小的解（见 Hypervolume.hv_truncate_2d）
     """
-    def __init__(self, archive_size):
+    def __init__(self, archive_size, truncation='crowding', reference_point=(0, 0)):
+        if truncation not in ('crowding', 'hv'):
+            raise ValueError(f"Unknown truncation strategy: {truncation}")
         self.archive = []      # 第一层非支配解（最优层）
         self.fronts = []       # 所有层次fronts
         self.archive_size = archive_size
+        self.truncation = truncation
+        self.reference_point = reference_point
+        self.population = None  # 按 fronts 顺序排列的全部候选（结构数组）
+        self.archive_costs = np.empty((0, 2))  # 与 archive 对齐的目标值
+        self.version = 0       # fronts 的版本号
+        self._snapshot = ()
+        self._snapshot_costs = ()
+        self._layout = []      # 每层 front 的大小
 
     def dominates(self, wolf1, wolf2):
         """判断wolf1是否支配wolf2（双目标最大化）"""
@@ -20,99 +43,57 @@ class ArchiveManager:
         """
         快速非支配排序 + 拥挤距离更新 Archive 和 Fronts。
         """
-        # === 🧠 Step 1: # 去重：保留 Position 相同但 Cost 更优的狼
-        position_map = dict()  # key = frozenset(Position), value = best wolf
-
-        for wolf in self.archive + wolves:
-            key = frozenset(wolf.Position)
-            if key not in position_map:
-                position_map[key] = wolf
-            else:
-                existing = position_map[key]
-                # 比较谁的 Cost 更优（传播和公平性更大）
-                if self.dominates(wolf, existing):
-                    position_map[key] = wolf
+        # === 🧠 Step 1: 复制为结构数组后按 Position 去重：保留 Position 相同但 Cost 更优的狼
+        # （复制后的存档与种群解耦，种群后续修改 Position 不会影响存档）
+        incoming = Population.from_wolves(self.archive + wolves)
+        costs = incoming.costs
+        keep = incoming.unique_positions(
+            prefer=lambda i, j: (costs[j] >= costs[i]).all() and (costs[j] > costs[i]).any())
 
         # 过滤后的候选集
-        candidates = list(position_map.values())
-
-        # === Step 2: 快速非支配排序 ===
-        # new_solutions = [wolf for wolf in wolves]
-        # candidates = self.archive + new_solutions
-
-        S = defaultdict(list)
-        n = dict()
-        ranks = dict()
-        fronts = [[]]
-
-        for i, p in enumerate(candidates):
-            S[i] = []
-            n[i] = 0
-            for j, q in enumerate(candidates):
-                if i == j:
-                    continue
-                if self.dominates(p, q):
-                    S[i].append(j)
-                elif self.dominates(q, p):
-                    n[i] += 1
-
-            if n[i] == 0:
-                ranks[i] = 0
-                fronts[0].append(i)
-
-        k = 0
-        while fronts[k]:
-            next_front = []
-            for i in fronts[k]:
-                for j in S[i]:
-                    n[j] -= 1
-                    if n[j] == 0:
-                        ranks[j] = k + 1
-                        next_front.append(j)
-            k += 1
-            fronts.append(next_front)
-
-        if not fronts[-1]:
-            fronts.pop()
-
-        self.fronts = [[candidates[i] for i in front] for front in fronts]
-
-        # === Step 3: 拥挤距离选择保留第一层 ===
+        candidates = incoming.take(keep)
+
+        # === Step 2: 非支配排序（双目标排序 + 扫描，O(N log N)） ===
+        fronts = non_dominated_sort(candidates.costs)
+
+        # fronts 内容未变时沿用上一版本的快照
+        order = [i for front in fronts for i in front]
+        layout = [len(front) for front in fronts]
+        ordered = candidates.take(order)
+        if not (layout == self._layout and ordered.same_as(self.population)):
+            self.population = ordered
+            self._layout = layout
+            bounds = np.cumsum([0] + layout)
+            self._snapshot = tuple(tuple(ordered[i] for i in range(lo, hi)) for lo, hi in zip(bounds[:-1], bounds[1:]))
+            self._snapshot_costs = tuple(ordered.costs[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:]))
+            self.version += 1
+        self.fronts = [list(front) for front in self._snapshot]
+
+        # === Step 3: 拥挤距离（或超体积贡献）选择保留第一层 ===
         first_front = self.fronts[0]
+        first_costs = self._snapshot_costs[0]
         if len(first_front) > self.archive_size:
-            first_front = self.calculate_crowding_distance(first_front)
-            first_front = first_front[:self.archive_size]
+            if self.truncation == 'hv':
+                keep = hv_truncate_2d(first_costs, self.archive_size, self.reference_point)
+            else:
+                keep = crowding_order(first_costs)[:self.archive_size]
+            first_front = [first_front[i] for i in keep]
+            first_costs = first_costs[keep]
 
         self.archive = first_front
+        self.archive_costs = first_costs
 
     def calculate_crowding_distance(self, archive):
         """计算拥挤距离并根据距离排序（从大到小）。"""
-        num_solutions = len(archive)
-        distances = [0.0] * num_solutions
-
-        for m in range(2):
-            archive.sort(key=lambda w: w.Cost[m])
-            distances[0] = distances[-1] = float('inf')
-            min_m = archive[0].Cost[m]
-            max_m = archive[-1].Cost[m]
-            if max_m == min_m:
-                continue
-
-            for i in range(1, num_solutions - 1):
-                distances[i] += (archive[i + 1].Cost[m] - archive[i - 1].Cost[m]) / (max_m - min_m)
-
-        sorted_archive = [w for _, w in sorted(zip(distances, archive), key=lambda pair: pair[0], reverse=True)]
-        return sorted_archive
+        order = crowding_order([wolf.Cost[:2] for wolf in archive])
+        return [archive[i] for i in order]
 
     def calculate_hypervolume(self, reference_point):
-        """计算当前第一层存档的HV（最大化问题）。"""
-        hv = 0.0
-        for wolf in self.archive:
-            f1, f2 = wolf.Cost[:2]
-            r1, r2 = reference_point
-            vol = max(0, f1 - r1) * max(0, f2 - r2)
-            hv += vol
-        return hv
+        """计算当前第一层存档的精确HV（最大化问题，矩形并集的面积）。"""
+        if len(self.archive_costs) != len(self.archive):
+            # 存档在 update() 之后被修改过（如 LeaderManager.ensure_leader_minimum 补充了个体）
+            return hypervolume_2d([wolf.Cost[:2] for wolf in self.archive], reference_point)
+        return hypervolume_2d(self.archive_costs, reference_point)
 
     def get_archive(self):
         """返回当前第一层存档（深拷贝）。"""
@@ -121,3 +102,11 @@ class ArchiveManager:
     def get_fronts(self):
         """返回所有fronts（多层次）。"""
         return copy.deepcopy(self.fronts)
+
+    def get_fronts_snapshot(self):
+        """返回当前版本 fronts 的只读快照（tuple of tuple，成员为存档副本，无需拷贝）。"""
+        return self._snapshot
+
+    def get_front_costs(self):
+        """返回与 get_fronts_snapshot() 逐层对齐的目标值数组（tuple of (n, 2) ndarray）。"""
+        return self._snapshot_costs
@@ -0,0 +1,77 @@
+import numpy as np
+
+def unique_keys(keys):
+    """整数键去重（排序 + 相邻比较），在大数组上明显快于 np.unique。"""
+    keys = np.sort(keys)
+    if keys.size > 1:
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return keys
+
+class CSRGraph:
+    """
+    将 networkx 图一次性编译为 int32 CSR（压缩稀疏行）数组：
+    - nodes[i]：下标 i 对应的原始节点编号（顺序与 graph.nodes() 一致）
+    - indptr[i]:indptr[i+1]：节点 i 的出边在 indices 中的区间
+    - indices：出边目标节点的下标（无向图每条边存两次）
+    后续的传播模拟、结构指标等都直接在这些数组上做向量化计算。
+    """
+
+    def __init__(self, graph):
+        self.nodes = list(graph.nodes())
+        self.num_nodes = len(self.nodes)
+        self.index_of = {node: i for i, node in enumerate(self.nodes)}
+
+        # === 按 graph.neighbors 的顺序展开所有出边 ===
+        degrees = np.fromiter((len(graph[node]) for node in self.nodes), dtype=np.int64, count=self.num_nodes)
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int32)
+        np.cumsum(degrees, out=self.indptr[1:])
+        self.indices = np.fromiter(
+            (self.index_of[nbr] for node in self.nodes for nbr in graph.neighbors(node)),
+            dtype=np.int32, count=int(self.indptr[-1])
+        )
+        self.num_arcs = len(self.indices)
+
+    @classmethod
+    def from_arrays(cls, indptr, indices, nodes=None):
+        """由已编译好的数组（如共享内存中的数组）直接构造，不再遍历 networkx 图。"""
+        csr = cls.__new__(cls)
+        csr.nodes = nodes
+        csr.num_nodes = len(indptr) - 1
+        csr.index_of = None if nodes is None else {node: i for i, node in enumerate(nodes)}
+        csr.indptr = indptr
+        csr.indices = indices
+        csr.num_arcs = len(indices)
+        return csr
+
+    def degree(self):
+        """每个节点的出度（int32 数组，按下标对齐）。"""
+        return np.diff(self.indptr)
+
+    def to_indices(self, seed_set):
+        """把节点编号集合转换为下标数组（保留原顺序与重复）。"""
+        return np.fromiter((self.index_of[n] for n in seed_set), dtype=np.int32)
+
+    def expand(self, owner, frontier):
+        """
+        展开 frontier 中所有节点的出边：
+        :param owner: 与 frontier 等长的归属编号（如模拟编号），随出边一起复制
+        :param frontier: 节点下标数组
+        :return: (每条出边的 owner, 每条出边在 indices 中的位置)
+        """
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return owner[:0], np.empty(0, dtype=np.int64)
+        # 把每个 [start, start+count) 区间展开为连续的边位置
+        offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        arcs = np.repeat(starts.astype(np.int64), counts) + offsets
+        return np.repeat(owner, counts), arcs
+
+    def reverse(self):
+        """反向图的 CSR（入边表）：reverse.indptr[v]:reverse.indptr[v+1] 为指向 v 的源节点下标。"""
+        sources = np.repeat(np.arange(self.num_nodes, dtype=np.int32), self.degree())
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(self.num_nodes + 1, dtype=np.int32)
+        np.cumsum(np.bincount(self.indices, minlength=self.num_nodes), out=indptr[1:])
+        return CSRGraph.from_arrays(indptr, sources[order], self.nodes)
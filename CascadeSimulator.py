@@ -0,0 +1,72 @@
+import numpy as np
+from CSRGraph import unique_keys
+
+class CascadeSimulator:
+    """
+    基于 CSR 数组的向量化独立级联（IC）模拟器：
+    - 所有模拟共享一组扁平的 frontier 数组 (模拟编号, 节点下标)；
+    - 每一轮扩散对整个 frontier 做一次批量 gather + 一次批量随机数抽样；
+    - 激活状态保存在 simulations × N 的布尔矩阵中（按行展平）。
+    批量模拟时按 MAX_CELLS 把种群切块：共享 frontier 摊薄了小图上的调用开销，
+    但在大图上中间数组超出缓存后反而比逐个集合模拟更慢，因此每块只放少量集合（大图上为 1 个）。
+    与 Evaluator.IC_model 的原始 Python 实现在统计意义上等价：
+    每个新激活节点对每个未激活邻居以 prob 概率尝试激活一次。
+    """
+
+    # 每块 种子集合数 × simulations × (边数 + 节点数) 的上限。按 email / facebook / Rice31 等数据集
+    # 对比逐个模拟测得：小图上每块可放几十个集合，facebook、Rice31 上每块 1 个集合时最快
+    MAX_CELLS = 1 << 21
+
+    def __init__(self, csr, seed=None):
+        self.csr = csr
+        self.rng = np.random.default_rng(seed)
+
+    def simulate(self, seed_indices, simulations, max_steps=2, prob=0.1):
+        """
+        对同一个种子集合运行 simulations 次独立模拟。
+        :param seed_indices: 种子节点下标数组（可含重复）
+        :return: 每次模拟的激活节点数（长度为 simulations 的数组）
+        """
+        return self.simulate_many([seed_indices], simulations, max_steps, prob)[0]
+
+    def simulate_many(self, seed_index_lists, simulations, max_steps=2, prob=0.1):
+        """
+        一次性模拟整个种群：种子集合 × 模拟次数 展开为 B × simulations 个独立世界，
+        共用同一组 frontier 数组推进。
+        :param seed_index_lists: B 个种子下标数组
+        :return: (B, simulations) 的激活节点数矩阵
+        """
+        n = self.csr.num_nodes
+        num_sets = len(seed_index_lists)
+        chunk = max(1, self.MAX_CELLS // (simulations * (self.csr.num_arcs + n)))
+        if num_sets > chunk:
+            return np.vstack([self.simulate_many(seed_index_lists[i:i + chunk], simulations, max_steps, prob)
+                              for i in range(0, num_sets, chunk)])
+
+        num_worlds = num_sets * simulations
+        active = np.zeros(num_worlds * n, dtype=bool)
+
+        # === 初始 frontier：世界 b * simulations + s 从第 b 个种子集合出发 ===
+        worlds, frontiers = [], []
+        for b, seed_indices in enumerate(seed_index_lists):
+            seeds = np.unique(np.asarray(seed_indices, dtype=np.int64))
+            worlds.append(np.repeat(np.arange(b * simulations, (b + 1) * simulations, dtype=np.int64), len(seeds)))
+            frontiers.append(np.tile(seeds, simulations))
+        world = np.concatenate(worlds) if worlds else np.empty(0, dtype=np.int64)
+        frontier = np.concatenate(frontiers) if frontiers else np.empty(0, dtype=np.int64)
+        active[world * n + frontier] = True
+
+        for _ in range(max_steps):
+            world, arcs = self.csr.expand(world, frontier)
+            if arcs.size == 0:
+                break
+            # 每条出边抽一次硬币，成功且目标尚未激活的节点进入下一轮
+            live = self.rng.random(arcs.size) < prob
+            keys = world[live] * n + self.csr.indices[arcs[live]]
+            keys = unique_keys(keys[~active[keys]])
+            if keys.size == 0:
+                break
+            active[keys] = True
+            world, frontier = np.divmod(keys, n)
+
+        return active.reshape(num_sets, simulations, n).sum(axis=2)
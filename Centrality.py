@@ -0,0 +1,222 @@
+import math
+import random
+import multiprocessing as mp
+import numpy as np
+import networkx as nx
+import scipy.sparse as sp
+from CSRGraph import CSRGraph
+
+# 基于 CSRGraph 的中心性计算，结果均为按节点下标（csr.nodes 的顺序）对齐的 NumPy 数组。
+# - 接近中心性使用按位并行的批量 BFS：64 个源节点共用一个 uint64 字，
+#   每一层对所有节点做一次 “入邻居 frontier 字按位或”（bitwise_or.reduceat），层数约为图的直径；
+# - 特征向量中心性与 PageRank 在 scipy.sparse 邻接矩阵上做稀疏矩阵-向量乘迭代，
+#   迭代公式与收敛判据与 networkx 相同；
+# - 精确接近中心性与介数中心性可按源节点分块在进程池中并行计算，各块的结果相加即为总和。
+
+MAX_CELLS = 1 << 25  # 每批 BFS 的 (边数 + 节点数) × 字数 上限（字节量级约为 8 倍）
+
+def _bfs_levels(in_csr, sources):
+    """
+    从 sources 同时出发的按位并行 BFS。
+    :param in_csr: 传播方向上的入边表：节点 v 在下一层被到达，当且仅当 in_csr 中 v 的某个邻居在当前层
+    :return: 生成器，依次产生 (层数 d, new)；new 为 (N, W) 的 uint64 位矩阵，
+             第 w 个字的第 j 位表示该节点在第 d 层首次被第 64 * w + j 个源到达
+    """
+    n = in_csr.num_nodes
+    num_sources = len(sources)
+    W = (num_sources + 63) // 64
+    column = np.arange(num_sources)
+    visited = np.zeros((n, W), dtype=np.uint64)
+    visited[sources, column // 64] |= np.uint64(1) << (column % 64).astype(np.uint64)
+    frontier = visited.copy()
+
+    # 只对有入边的节点做 reduceat（孤立节点的区间为空）
+    has_edges = np.flatnonzero(np.diff(in_csr.indptr))
+    starts = in_csr.indptr[has_edges]
+
+    level = 0
+    while True:
+        level += 1
+        new = np.zeros_like(visited)
+        if has_edges.size:
+            new[has_edges] = np.bitwise_or.reduceat(frontier[in_csr.indices], starts, axis=0)
+        new &= ~visited
+        if not new.any():
+            return
+        visited |= new
+        frontier = new
+        yield level, new
+
+def _batch_size(csr):
+    """每批源节点数（64 的倍数）。"""
+    words = max(1, MAX_CELLS // (8 * (csr.num_arcs + 4 * csr.num_nodes)))
+    return 64 * words
+
+def _closeness(reached, total, num_nodes):
+    """与 nx.closeness_centrality（wf_improved=True）相同的公式与运算顺序。"""
+    closeness = np.zeros(len(reached))
+    if num_nodes <= 1:
+        return closeness
+    mask = total > 0
+    r = reached[mask].astype(float)
+    closeness[mask] = (r / total[mask]) * (r / (num_nodes - 1))
+    return closeness
+
+def _distance_sums(csr, lo, hi):
+    """源节点 lo..hi-1 各自的可达节点数（不含自身）与距离和（沿出边的反方向）。"""
+    reached = np.zeros(hi - lo, dtype=np.int64)
+    total = np.zeros(hi - lo, dtype=np.int64)
+    batch = _batch_size(csr)
+    for start in range(lo, hi, batch):
+        sources = np.arange(start, min(start + batch, hi))
+        for level, new in _bfs_levels(csr, sources):
+            bits = np.unpackbits(new.view(np.uint8), axis=1, bitorder='little')
+            counts = bits.sum(axis=0, dtype=np.int64)[:len(sources)]
+            reached[sources - lo] += counts
+            total[sources - lo] += level * counts
+    return reached, total
+
+def _source_chunks(num_sources, workers):
+    """把源节点切成 workers * 4 块左右，便于进程池负载均衡。"""
+    size = max(1, -(-num_sources // (workers * 4)))
+    return [(lo, min(lo + size, num_sources)) for lo in range(0, num_sources, size)]
+
+_worker = {}
+
+def _init_closeness_worker(indptr, indices):
+    _worker['csr'] = CSRGraph.from_arrays(indptr, indices)
+
+def _closeness_chunk(bounds):
+    return _distance_sums(_worker['csr'], *bounds)
+
+def closeness_centrality(csr, workers=1):
+    """
+    精确的接近中心性，结果与 nx.closeness_centrality 一致（有向图同样按到达该节点的距离计算）。
+    从每个节点出发沿出边的反方向做 BFS，位矩阵的每一列即一个源节点的逐层到达数。
+    :param workers: >1 时按源节点分块在进程池中并行
+    """
+    n = csr.num_nodes
+    if workers <= 1:
+        reached, total = _distance_sums(csr, 0, n)
+    else:
+        with mp.Pool(workers, initializer=_init_closeness_worker, initargs=(csr.indptr, csr.indices)) as pool:
+            parts = pool.map(_closeness_chunk, _source_chunks(n, workers))
+        reached = np.concatenate([part[0] for part in parts])
+        total = np.concatenate([part[1] for part in parts])
+    return _closeness(reached, total, n)
+
+def approx_closeness_centrality(csr, epsilon=0.1, seed=None, num_pivots=None):
+    """
+    Eppstein–Wang 式抽样近似：均匀抽取 k = ⌈ln(n) / ε²⌉ 个枢纽节点，沿出边做 BFS，
+    以枢纽到 v 的平均距离估计所有节点到 v 的平均距离（误差不超过 ε·直径的概率至少 1 - 2/n）。
+    不连通时用能到达 v 的枢纽比例估计可达比例，与 wf_improved 的修正一致。
+    :param num_pivots: 直接指定枢纽数 k（忽略 epsilon）
+    k ≥ n 时直接返回精确值。
+    """
+    n = csr.num_nodes
+    k = math.ceil(math.log(max(n, 2)) / epsilon ** 2) if num_pivots is None else num_pivots
+    if k >= n:
+        return closeness_centrality(csr)
+    pivots = np.sort(np.random.default_rng(seed).choice(n, size=k, replace=False))
+
+    # 沿出边前进：下一层由入邻居决定，因此用反向图作为入边表
+    reverse = csr.reverse()
+    reached = np.zeros(n, dtype=np.int64)
+    total = np.zeros(n, dtype=np.int64)
+    batch = _batch_size(csr)
+    for lo in range(0, k, batch):
+        for level, new in _bfs_levels(reverse, pivots[lo:lo + batch]):
+            # 每个节点本层被多少个枢纽首次到达（按行数 1 位；np.bitwise_count 需要 NumPy ≥ 2.0）
+            counts = np.unpackbits(new.view(np.uint8), axis=1, bitorder='little').sum(axis=1, dtype=np.int64)
+            reached += counts
+            total += level * counts
+
+    # 枢纽自身不计入（距离为 0），每个节点的有效样本数为除自身外的枢纽数
+    samples = k - np.isin(np.arange(n), pivots)
+    closeness = np.zeros(n)
+    mask = total > 0
+    closeness[mask] = (reached[mask] / samples[mask]) * (reached[mask] / total[mask])
+    return closeness
+
+def adjacency(csr):
+    """scipy.sparse 邻接矩阵：A[u, v] = 1 表示边 u → v（无向图对称）。可构建一次后传给下面的函数复用。"""
+    return sp.csr_array((np.ones(csr.num_arcs), csr.indices, csr.indptr), shape=(csr.num_nodes, csr.num_nodes))
+
+def eigenvector_centrality(csr, max_iter=100, tol=1.0e-6, A=None):
+    """
+    特征向量中心性，与 nx.eigenvector_centrality 相同：在 A^T + I 上做幂迭代，每步按 2-范数归一化，
+    各分量变化量之和小于 n * tol 时收敛，max_iter 次内未收敛时抛出 PowerIterationFailedConvergence。
+    """
+    A = adjacency(csr) if A is None else A
+    n = csr.num_nodes
+    in_adjacency = A.T.tocsr()
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        xlast = x
+        x = xlast + in_adjacency @ xlast
+        norm = math.hypot(*x) or 1
+        x = x / norm
+        if np.abs(x - xlast).sum() < n * tol:
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+def pagerank(csr, alpha=0.85, max_iter=100, tol=1.0e-6, A=None):
+    """PageRank，与 nx.pagerank（均匀个性化向量、悬挂节点均匀分配）相同的迭代与收敛判据。"""
+    A = adjacency(csr) if A is None else A
+    N = csr.num_nodes
+    S = A.sum(axis=1)
+    S[S != 0] = 1.0 / S[S != 0]
+    A = sp.dia_array((S.T, 0), shape=A.shape) @ A
+
+    x = np.repeat(1.0 / N, N)
+    p = np.repeat(1.0 / N, N)
+    is_dangling = np.where(S == 0)[0]
+    for _ in range(max_iter):
+        xlast = x
+        x = alpha * (x @ A + sum(x[is_dangling]) * p) + (1 - alpha) * p
+        if np.absolute(x - xlast).sum() < N * tol:
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+def _init_betweenness_worker(graph):
+    _worker['graph'] = graph
+
+def _betweenness_chunk(sources):
+    graph = _worker['graph']
+    return nx.betweenness_centrality_subset(graph, sources, list(graph), normalized=False)
+
+def betweenness_centrality(graph, k=None, workers=1, seed=None):
+    """
+    介数中心性，与 nx.betweenness_centrality(graph, k=k, seed=seed)（normalized=True）相同：
+    每个源节点的依赖值（Brandes 累加）相加后按有效节点对数缩放；给出 k 时只从 k 个抽样源节点出发。
+    :param workers: >1 时按源节点分块在进程池中并行（nx.betweenness_centrality_subset），各块结果相加
+    :param seed: 抽样源节点的随机种子（与 networkx 相同的 random.Random(seed).sample）
+    :return: 按 graph.nodes() 顺序对齐的数组
+    """
+    nodes = list(graph)
+    if k is None:
+        sources = nodes
+    else:
+        sources = (random.Random(seed) if seed is not None else random).sample(nodes, k)
+
+    if workers <= 1:
+        parts = [nx.betweenness_centrality_subset(graph, sources, nodes, normalized=False)]
+    else:
+        chunks = [sources[lo:hi] for lo, hi in _source_chunks(len(sources), workers)]
+        with mp.Pool(workers, initializer=_init_betweenness_worker, initargs=(graph,)) as pool:
+            parts = pool.map(_betweenness_chunk, chunks)
+    # subset 版本对无向图已除以 2，还原为有序 (s, t) 对的依赖值之和
+    correction = 1 if graph.is_directed() else 2
+    betweenness = np.array([sum(part[v] for part in parts) for v in nodes], dtype=float) * correction
+
+    # 与 networkx 的 _rescale（normalized=True, endpoints=False）一致
+    N = len(nodes) - 1
+    if N < 2:
+        return betweenness
+    if k is None:
+        return betweenness * (1 / (N * (N - 1)))
+    scale_source = 1 / ((k - 1) * (N - 1)) if k > 1 else math.nan
+    scale_nonsource = 1 / (k * (N - 1))
+    source_set = set(sources)
+    is_source = np.fromiter((v in source_set for v in nodes), dtype=bool, count=len(nodes))
+    return betweenness * np.where(is_source, scale_source, scale_nonsource)
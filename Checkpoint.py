@@ -0,0 +1,92 @@
+import os
+import pickle
+import threading
+
+# 优化器检查点：状态字典用 pickle 协议 5 序列化（numpy 数组按原始缓冲区写出），
+# 先写入同目录下的临时文件再 os.replace，中断时磁盘上总是完整的上一份检查点。
+
+PROTOCOL = 5
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def save_checkpoint(path, state):
+    """同步写出检查点。"""
+    _write_atomic(path, pickle.dumps(state, protocol=PROTOCOL))
+
+def load_checkpoint(path):
+    """读取检查点，返回保存时的状态字典。"""
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def is_resumable(path):
+    """path 处是否有可以续跑的检查点（存在且对应的运行尚未完成）。"""
+    return os.path.exists(path) and not load_checkpoint(path).get('complete', False)
+
+class CheckpointWriter:
+    """
+    后台线程写检查点：
+    - save() 在调用线程中把状态序列化为 bytes（得到一致的快照，之后种群、存档可以继续修改）；
+    - 写文件、fsync 与原子替换在后台线程完成，不阻塞优化主循环；
+    - 磁盘跟不上时只保留最新的一份待写快照，旧快照直接丢弃；
+    - 后台写入出错时，在下一次 save() 或 close() 时抛出。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._pending = None
+        self._closed = False
+        self._error = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='CheckpointWriter', daemon=True)
+        self._thread.start()
+
+    def save(self, state):
+        data = pickle.dumps(state, protocol=PROTOCOL)
+        with self._cond:
+            self._raise_error()
+            if self._closed:
+                raise RuntimeError("CheckpointWriter is closed")
+            self._pending = data
+            self._cond.notify()
+
+    def close(self):
+        """等待最后一份检查点写完并结束后台线程（可重复调用）。"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        with self._cond:
+            self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                data, self._pending = self._pending, None
+            try:
+                _write_atomic(self.path, data)
+            except Exception as e:
+                with self._cond:
+                    self._error = e
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
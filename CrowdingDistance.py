@@ -0,0 +1,31 @@
+import numpy as np
+
+# 拥挤距离（NSGA-II）：每个目标上按值排序，内部点累加相邻两点差值 / 该目标的取值范围，
+# 各目标上的两个端点距离为无穷大。所有存档实现（ArchiveManager、paretosolution、
+# ParetoArchive、LeaderManager）共用这里的向量化实现。
+
+def crowding_distance(costs):
+    """
+    :param costs: (N, M) 目标值矩阵
+    :return: 与 costs 行对齐的拥挤距离数组
+    """
+    costs = np.asarray(costs, dtype=float)
+    costs = costs.reshape(len(costs), -1)
+    num_points, num_objectives = costs.shape
+    distances = np.zeros(num_points)
+    if num_points == 0:
+        return distances
+
+    for m in range(num_objectives):
+        order = np.argsort(costs[:, m], kind='stable')
+        values = costs[order, m]
+        distances[order[0]] = distances[order[-1]] = np.inf
+        span = values[-1] - values[0]
+        if span == 0:
+            continue
+        distances[order[1:-1]] += (values[2:] - values[:-2]) / span
+    return distances
+
+def crowding_order(costs):
+    """按拥挤距离从大到小排列的下标（距离相同时保持原顺序）。"""
+    return np.argsort(-crowding_distance(costs), kind='stable')
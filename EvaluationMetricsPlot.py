@@ -1,7 +1,7 @@
 import os
 import numpy as np
 import matplotlib.pyplot as plt
-from ArchiveManager import ArchiveManager
+from NonDominatedSort import non_dominated_mask
 
 def generate_true_pareto_front(all_algorithms_solutions):
     """
@@ -10,8 +10,7 @@ def generate_true_pareto_front(all_algorithms_solutions):
     """
     combined = np.vstack(all_algorithms_solutions)
 
-    manager = ArchiveManager(archive_size=1000000)  # 临时用来调用dominates，不真正用它管理
-    pareto_mask = [not any(manager.dominates(other, sol) for other in combined) for sol in combined]
+    pareto_mask = non_dominated_mask(combined[:, :2])
     return combined[pareto_mask]
 
 def calculate_igd(pf, reference_pf):
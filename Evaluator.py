@@ -1,22 +1,82 @@
 import random
 import numpy as np
-from collections import Counter
+from collections import Counter, OrderedDict
 import math
+from CSRGraph import CSRGraph
+from CascadeSimulator import CascadeSimulator
+from LiveEdgeWorlds import LiveEdgeWorlds
+from RRSetIndex import RRSetIndex
+from FairnessScorer import FairnessScorer
+
+class SpreadState:
+    """
+    增量评估的父状态（由 Evaluator.evaluate_state / evaluate_delta 返回）：
+    - seeds：种子节点列表（保留重复）
+    - cost：(spread, fairness)
+    - counts：live_edge 模式下每个 (世界, 节点) 被多少个种子覆盖（R × N 展平）；其他模式为 None
+    - covered：counts 中的非零项个数
+    """
+
+    def __init__(self, seeds, cost, counts=None, covered=0):
+        self.seeds = seeds
+        self.cost = cost
+        self.counts = counts
+        self.covered = covered
 
 class Evaluator:
     """
     Evaluator类（社区感知版本）：
     - 评估扩散性（Spread）
     - 评估社区公平性（Fairness）：加权社区覆盖 + 节点分布均衡性
+    扩散模拟后端（backend）：
+    - 'csr'：图编译为 int32 CSR 数组，批量向量化模拟（默认）
+    - 'python'：原始的 networkx 邻接遍历 + 逐边 random.random()
+    - 'live_edge'：构造时预采样 simulations 个 live-edge 世界（公共随机数），
+      每次查询只做固定世界上的可达性统计，同一种子集合结果确定
+    - 'rr'：构造时生成 rr_sets 个反向可达（RR）集合并建立倒排索引，
+      spread ≈ N × 被覆盖的 RR 集合比例，每次查询只是一次覆盖计数，结果确定
+    评估缓存（cache_size）：按规范化的种子集合键做 LRU 记忆，命中时直接返回首次评估结果；
+    默认只在结果确定的 'live_edge' / 'rr' 模式下开启，随机模拟后端命中时会复用第一次的估计值。
+    评估精度（fidelity）：evaluate / evaluate_many 可按调用指定 'cheap' 或 'precise'，
+    此时随机模拟后端改用自适应蒙特卡洛（见 estimate_spread_many），且不经过缓存。
     """
 
-    def __init__(self, graph, node_to_comm, total_communities, num_information=1, simulations=10):
+    # 自适应蒙特卡洛档位：target_se 为相对标准误目标，batch 为每批模拟次数
+    FIDELITY = {
+        'cheap': {'target_se': 0.10, 'batch': 5, 'max_simulations': 20},
+        'precise': {'target_se': 0.02, 'batch': 10, 'max_simulations': 500},
+    }
+
+    def __init__(self, graph, node_to_comm, total_communities, num_information=1, simulations=10,
+                 backend='csr', seed=None, cache_size=None, rr_sets=20000):
         self.graph = graph
         self.nodes = list(graph.nodes())
         self.total_nodes = len(self.nodes)
         self.num_information = num_information
         self.simulations = simulations
 
+        # ✅ 扩散模拟后端：CSR 只在构造时编译一次
+        if backend not in ('csr', 'python', 'live_edge', 'rr'):
+            raise ValueError(f"Unknown simulation backend: {backend}")
+        self.backend = backend
+        if backend == 'csr':
+            self.csr = CSRGraph(graph)
+            self.simulator = CascadeSimulator(self.csr, seed=seed)
+        elif backend == 'live_edge':
+            self.csr = CSRGraph(graph)
+            self.worlds = LiveEdgeWorlds(self.csr, num_worlds=simulations, seed=seed)
+        elif backend == 'rr':
+            self.csr = CSRGraph(graph)
+            self.rr_index = RRSetIndex(self.csr, num_sets=rr_sets, seed=seed)
+
+        # ✅ 评估缓存：LRU 淘汰，容量为 0 表示关闭
+        if cache_size is None:
+            cache_size = 10000 if backend in ('live_edge', 'rr') else 0
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
         # ✅ 添加社区信息
         self.node_to_comm = node_to_comm
         self.total_communities = total_communities
@@ -25,6 +85,10 @@ class Evaluator:
         self.community_sizes = Counter(node_to_comm.values())
         self.total_nodes_in_communities = sum(self.community_sizes.values())
 
+        # ✅ 编译后的公平性评分：社区编号为按节点下标排列的 int32 数组，批量评估时使用
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.fairness_scorer = FairnessScorer.from_mapping(self.nodes, node_to_comm)
+
     def IC_model(self, seed_set, max_steps=2, prob=0.1):
         """
         独立级联模型，运行多次模拟，返回平均激活节点数
@@ -33,9 +97,26 @@ class Evaluator:
         :param prob: 每条边的传播概率
         :return: 平均被激活的节点集合大小（或激活率）
         """
-        total_activated = 0
+        if self.backend == 'csr':
+            activated = self.simulator.simulate(self.csr.to_indices(seed_set), self.simulations, max_steps, prob)
+            return activated.mean()
+        if self.backend == 'live_edge':
+            self._check_world_prob(prob)
+            return self.worlds.reach_many([self.csr.to_indices(seed_set)], max_steps)[0].mean()
+        if self.backend == 'rr':
+            self._check_rr_params(max_steps, prob)
+            return self.rr_index.estimate_many([self.csr.to_indices(seed_set)])[0]
 
-        for _ in range(self.simulations):
+        total_activated = sum(self._simulate_python(seed_set, self.simulations, max_steps, prob))
+
+        avg_activated = total_activated / self.simulations
+        return avg_activated
+
+    def _simulate_python(self, seed_set, simulations, max_steps=2, prob=0.1):
+        """原始的 networkx 邻接遍历实现，返回每次模拟的激活节点数。"""
+        activated_counts = []
+
+        for _ in range(simulations):
             activated = set(seed_set)
             new_active = set(seed_set)
 
@@ -50,10 +131,78 @@ class Evaluator:
                     break
                 new_active = next_active
 
-            total_activated += len(activated)
+            activated_counts.append(len(activated))
 
-        avg_activated = total_activated / self.simulations
-        return avg_activated
+        return activated_counts
+
+    def estimate_spread_many(self, seed_sets, fidelity='precise'):
+        """
+        自适应蒙特卡洛：对每个种子集合分批追加模拟，直到相对标准误 se / mean ≤ target_se
+        或模拟次数达到 max_simulations；已收敛的集合不再参与后续批次。
+        live_edge 模式下世界是固定的，直接使用全部 R 个世界；rr 模式直接使用全部 RR 集合。
+        :param fidelity: 'cheap' / 'precise'，或自定义 dict(target_se=, batch=, max_simulations=)
+        :return: (平均激活数, 使用的模拟次数, 激活数的样本方差)，均为长度 B 的数组
+        """
+        num_sets = len(seed_sets)
+        if self.backend == 'live_edge':
+            counts = self.worlds.reach_many([self.csr.to_indices(seed_set) for seed_set in seed_sets])
+            variance = counts.var(axis=1, ddof=1) if self.worlds.num_worlds > 1 else np.zeros(num_sets)
+            return counts.mean(axis=1), np.full(num_sets, self.worlds.num_worlds), variance
+        if self.backend == 'rr':
+            # 每个 RR 集合是一次伯努利样本 N × 1[覆盖]，方差为 N² p (1 - p)
+            theta = self.rr_index.num_sets
+            covered = self.rr_index.coverage_many([self.csr.to_indices(seed_set) for seed_set in seed_sets]) / theta
+            variance = self.total_nodes ** 2 * covered * (1 - covered)
+            return self.total_nodes * covered, np.full(num_sets, theta), variance
+
+        params = self.FIDELITY[fidelity] if isinstance(fidelity, str) else fidelity
+        batch = max(2, params['batch'])
+        max_simulations = max(batch, params['max_simulations'])
+
+        total = np.zeros(num_sets)
+        total_sq = np.zeros(num_sets)
+        used = np.zeros(num_sets, dtype=int)
+        pending = np.arange(num_sets)
+
+        while pending.size:
+            # 未收敛的集合进度一致，本批次不超过上限
+            step = min(batch, max_simulations - used[pending[0]])
+            counts = self._simulate_counts([seed_sets[i] for i in pending], step).astype(float)
+            total[pending] += counts.sum(axis=1)
+            total_sq[pending] += (counts ** 2).sum(axis=1)
+            used[pending] += step
+
+            n = used[pending]
+            mean = total[pending] / n
+            variance = np.maximum(total_sq[pending] - n * mean ** 2, 0.0) / (n - 1)
+            converged = np.sqrt(variance / n) <= params['target_se'] * mean
+            pending = pending[~(converged | (n >= max_simulations))]
+
+        mean = total / used
+        variance = np.maximum(total_sq - used * mean ** 2, 0.0) / (used - 1)
+        return mean, used, variance
+
+    def estimate_spread(self, seed_set, fidelity='precise'):
+        """单个种子集合的自适应估计，返回 (平均激活数, 使用的模拟次数, 样本方差)。"""
+        mean, used, variance = self.estimate_spread_many([seed_set], fidelity)
+        return mean[0], int(used[0]), variance[0]
+
+    def _simulate_counts(self, seed_sets, simulations):
+        """随机模拟后端：返回 (B, simulations) 的激活节点数矩阵。"""
+        if self.backend == 'csr':
+            return self.simulator.simulate_many([self.csr.to_indices(seed_set) for seed_set in seed_sets], simulations)
+        return np.array([self._simulate_python(seed_set, simulations) for seed_set in seed_sets])
+
+    def _check_world_prob(self, prob):
+        """live-edge 世界在构造时按固定传播概率采样，查询时不能更换概率。"""
+        if prob != self.worlds.prob:
+            raise ValueError(f"Live-edge worlds were sampled with prob={self.worlds.prob}, got prob={prob}")
+
+    def _check_rr_params(self, max_steps, prob):
+        """RR 集合在构造时按固定的传播概率和轮数生成，查询时不能更换。"""
+        if prob != self.rr_index.prob or max_steps != self.rr_index.max_steps:
+            raise ValueError(f"RR sets were sampled with prob={self.rr_index.prob}, "
+                             f"max_steps={self.rr_index.max_steps}, got prob={prob}, max_steps={max_steps}")
 
     def fairness(self, seed_set, w_cov=0.5, w_entropy=0.5):
         """
@@ -83,12 +232,207 @@ class Evaluator:
         fairness_score = w_cov * coverage_score + w_entropy * entropy_score #综合两个指标，加权求和得到最终公平性得分
         return fairness_score
 
-    def evaluate(self, seed_set):
+    def fairness_many(self, seed_sets, w_cov=0.5, w_entropy=0.5):
+        """批量公平性：种群转为 (pop, budget) 下标矩阵后一次性计算，结果与逐个调用 fairness 一致。"""
+        index_lists = [[self.node_index[n] for n in seed_set] for seed_set in seed_sets]
+        return self.fairness_scorer.score_many(FairnessScorer.pad(index_lists), w_cov, w_entropy)
+
+    @staticmethod
+    def cache_key(seed_set):
+        """规范化的种子集合键：排序后的元组（保留重复节点，公平性计算会用到重复次数）。"""
+        return tuple(sorted(seed_set))
+
+    def _cache_get(self, key):
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return self.cache[key]
+        self.cache_misses += 1
+        return None
+
+    def _cache_put(self, key, cost):
+        self.cache[key] = cost
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)  # 淘汰最久未使用的键
+
+    def cache_info(self):
+        """返回缓存命中统计。"""
+        return {'hits': self.cache_hits, 'misses': self.cache_misses,
+                'maxsize': self.cache_size, 'currsize': len(self.cache)}
+
+    def evaluate(self, seed_set, fidelity=None):
         """
         综合评估：扩散性 + 社区公平性
+        :param fidelity: None 表示固定 simulations 次模拟；'cheap' / 'precise' 表示自适应精度
         """
+        if fidelity is not None and self.backend in ('csr', 'python'):
+            spread, fair = self.evaluate_many([seed_set], fidelity)[0]
+            return spread, fair
+
+        if self.cache_size:
+            key = self.cache_key(seed_set)
+            cost = self._cache_get(key)
+            if cost is not None:
+                return cost
+
         avg_activated = self.IC_model(seed_set)
         spread = avg_activated / self.total_nodes
         fair = self.fairness(seed_set)
+
+        if self.cache_size:
+            self._cache_put(key, (spread, fair))
         return spread, fair
 
+    def evaluate_state(self, seed_set):
+        """
+        评估种子集合，并保留每个世界中的覆盖计数，作为 evaluate_delta 的父状态。
+        仅 live_edge 模式保留计数；其他模式退化为普通 evaluate。
+        """
+        seeds = list(seed_set)
+        if self.backend != 'live_edge':
+            return SpreadState(seeds, self.evaluate(seeds))
+
+        counts = np.zeros(self.worlds.num_worlds * self.total_nodes, dtype=np.uint16)
+        for node in self.csr.to_indices(seeds):
+            counts[self.worlds.node_reach(node)] += 1
+        covered = np.count_nonzero(counts)
+        return SpreadState(seeds, self._cost_from_covered(seeds, covered), counts, covered)
+
+    def evaluate_delta(self, state, add=(), remove=()):
+        """
+        增量评估：在父状态 state 的基础上删除 remove、加入 add 中的节点。
+        live_edge 模式下只重算被增删节点的可达集（reach(S) 是各种子可达集的并），
+        其余世界/节点的覆盖计数直接沿用父状态。
+        只需要目标值时用 delta_cost（不复制计数数组），确定接受该变动后再调用本方法生成子状态。
+        :return: 子集合的 SpreadState（cost 即 (spread, fairness)）
+        """
+        seeds = self._delta_seeds(state, add, remove)
+        if state.counts is None:
+            return SpreadState(seeds, self.evaluate(seeds))
+
+        counts = state.counts.copy()
+        covered = self._apply_delta(counts, state.covered, add, remove)
+        return SpreadState(seeds, self._cost_from_covered(seeds, covered), counts, covered)
+
+    def delta_cost(self, state, add=(), remove=()):
+        """
+        与 evaluate_delta(state, add, remove).cost 相同，但不生成子状态：
+        只加入一个节点时直接由 counts[keys] == 0 统计新覆盖数；其他情况在父状态的计数上原地增删后还原。
+        两种情况都不复制 R×N 的计数数组。
+        """
+        seeds = self._delta_seeds(state, add, remove)
+        if state.counts is None:
+            return self.evaluate(seeds)
+
+        if len(add) == 1 and not remove:
+            keys = self.worlds.node_reach(self.csr.index_of[add[0]])
+            covered = state.covered + np.count_nonzero(state.counts[keys] == 0)
+        else:
+            covered = self._apply_delta(state.counts, state.covered, add, remove)
+            self._apply_delta(state.counts, covered, remove, add)
+        return self._cost_from_covered(seeds, covered)
+
+    @staticmethod
+    def _delta_seeds(state, add, remove):
+        seeds = list(state.seeds)
+        for node in remove:
+            seeds.remove(node)
+        seeds.extend(add)
+        return seeds
+
+    def _apply_delta(self, counts, covered, add, remove):
+        """在 counts 上原地删除 remove、加入 add 的可达集，返回新的覆盖数。"""
+        for node in remove:
+            keys = self.worlds.node_reach(self.csr.index_of[node])
+            counts[keys] -= 1
+            covered -= np.count_nonzero(counts[keys] == 0)
+        for node in add:
+            keys = self.worlds.node_reach(self.csr.index_of[node])
+            covered += np.count_nonzero(counts[keys] == 0)
+            counts[keys] += 1
+        return covered
+
+    def _cost_from_covered(self, seeds, covered):
+        avg_activated = covered / self.worlds.num_worlds
+        return avg_activated / self.total_nodes, self.fairness(seeds)
+
+    def evaluate_many(self, seed_sets, fidelity=None):
+        """
+        批量评估整个种群：所有种子集合的所有模拟一次性推进。
+        开启缓存时，命中的集合直接取缓存，同一批次内的重复集合只模拟一次。
+        :param seed_sets: 种子集合列表
+        :param fidelity: None / 'cheap' / 'precise'（见 evaluate）
+        :return: (len(seed_sets), 2) 数组，每行为 [spread, fairness]
+        """
+        if fidelity is not None and self.backend in ('csr', 'python'):
+            results = np.empty((len(seed_sets), 2))
+            results[:, 0] = self.estimate_spread_many(seed_sets, fidelity)[0] / self.total_nodes
+            results[:, 1] = self.fairness_many(seed_sets)
+            return results
+
+        if not self.cache_size:
+            return self._evaluate_batch(seed_sets)
+
+        results = np.empty((len(seed_sets), 2))
+        pending = OrderedDict()  # key → 该 key 在 seed_sets 中的位置列表
+        for i, seed_set in enumerate(seed_sets):
+            key = self.cache_key(seed_set)
+            if key in pending:
+                pending[key].append(i)
+                self.cache_hits += 1
+                continue
+            cost = self._cache_get(key)
+            if cost is not None:
+                results[i] = cost
+            else:
+                pending[key] = [i]
+
+        if pending:
+            misses = self._evaluate_batch([seed_sets[positions[0]] for positions in pending.values()])
+            for (key, positions), cost in zip(pending.items(), misses):
+                results[positions] = cost
+                self._cache_put(key, (cost[0], cost[1]))
+        return results
+
+    def get_state(self):
+        """
+        断点续跑所需的评估器状态：CSR 模拟器的随机数状态与评估缓存。
+        live_edge / rr 的样本在构造时由 seed 决定，续跑时需用相同的 seed 构造评估器；
+        python 后端使用全局 random，由调用方保存。
+        """
+        state = {'cache': OrderedDict(self.cache), 'cache_hits': self.cache_hits, 'cache_misses': self.cache_misses}
+        if self.backend == 'csr':
+            state['rng'] = self.simulator.rng.bit_generator.state
+        return state
+
+    def set_state(self, state):
+        """恢复 get_state() 保存的状态。"""
+        self.cache = OrderedDict(state['cache'])
+        self.cache_hits = state['cache_hits']
+        self.cache_misses = state['cache_misses']
+        if 'rng' in state:
+            self.simulator.rng.bit_generator.state = state['rng']
+
+    def close(self):
+        """释放评估资源。单进程评估器没有需要释放的资源，ParallelEvaluator 会覆盖此方法。"""
+        pass
+
+    def _evaluate_batch(self, seed_sets):
+        """不经过缓存，直接批量模拟。"""
+        if self.backend == 'csr':
+            index_lists = [self.csr.to_indices(seed_set) for seed_set in seed_sets]
+            avg_activated = self.simulator.simulate_many(index_lists, self.simulations).mean(axis=1)
+        elif self.backend == 'live_edge':
+            index_lists = [self.csr.to_indices(seed_set) for seed_set in seed_sets]
+            avg_activated = self.worlds.reach_many(index_lists).mean(axis=1)
+        elif self.backend == 'rr':
+            index_lists = [self.csr.to_indices(seed_set) for seed_set in seed_sets]
+            avg_activated = self.rr_index.estimate_many(index_lists)
+        else:
+            avg_activated = np.array([self.IC_model(seed_set) for seed_set in seed_sets], dtype=float)
+
+        results = np.empty((len(seed_sets), 2))
+        results[:, 0] = avg_activated / self.total_nodes
+        results[:, 1] = self.fairness_many(seed_sets)
+        return results
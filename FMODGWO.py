@@ -95,11 +95,14 @@ class FMODGWO:
 
                 # 设置狼的种子集合为构造好的节点集
             wolf.Position = selected
-            # 评估该种子集合的多目标成本（传播、成本、公平性等）
-            wolf.Cost = self.evaluator.evaluate(wolf.Position)
             # 将该个体添加到种群中
             self.population.append(wolf)
 
+        # 整个种群一次性批量评估多目标成本（传播、公平性等）
+        costs = self.evaluator.evaluate_many([wolf.Position for wolf in self.population])
+        for wolf, cost in zip(self.population, costs):
+            wolf.Cost = tuple(cost)
+
     def optimize(self, max_iter):
         """
         主优化流程：基于统一过渡点的动态机制，协同更新每只狼的位置。
@@ -126,7 +129,7 @@ class FMODGWO:
                 # archive = self.archive_mgr.archive
 
                 # 动态选择当前的leaders
-                alpha, beta, delta = self.leader_mgr.select_leaders_by_region(self.archive_mgr.get_fronts())
+                alpha, beta, delta = self.leader_mgr.select_leaders_by_region(self.archive_mgr.get_fronts_snapshot())
 
                 # 构建三头狼和当前狼的共同节点
                 base = wolf.Position & alpha.Position & beta.Position & delta.Position
@@ -139,12 +142,8 @@ class FMODGWO:
                     candidate_nodes = list(all_nodes - forbidden_nodes)
                     # 使用 score() 函数为候选节点打分（小closeness + 大degree优先）
                     # 为所有候选节点打分
-                    scores = []
-                    for node in candidate_nodes:
-                        score = self.StructureMetrics.score(node, t, max_iter, transition_point)
-                        scores.append((node, score))
-                    scores.sort(key=lambda x: x[1], reverse=True)
-                    candidate_nodes = [node for node, _ in scores]
+                    # 整代共用的评分向量（StructureMetrics.scores_at 按代缓存），一次排序
+                    candidate_nodes = self.StructureMetrics.rank_nodes(candidate_nodes, t, max_iter, transition_point)
 
                     needed = self.budget - len(base)
                     new_nodes = set(candidate_nodes[:needed])
@@ -168,12 +167,8 @@ class FMODGWO:
                         new_nodes = set(candidate_nodes)
                     else:
                         # 用score函数对local候选节点打分（小closeness + 大degree优先）
-                        scores = []
-                        for node in candidate_nodes:
-                            score = self.StructureMetrics.score(node, t, max_iter, transition_point)
-                            scores.append((node, score))
-                        scores.sort(key=lambda x: x[1], reverse=True)
-                        candidate_nodes = [node for node, _ in scores]
+                        # 整代共用的评分向量（StructureMetrics.scores_at 按代缓存），一次排序
+                        candidate_nodes = self.StructureMetrics.rank_nodes(candidate_nodes, t, max_iter, transition_point)
                         new_nodes = set(candidate_nodes[:needed])
                 # 合成新的位置
                 new_position = base | new_nodes
@@ -185,9 +180,13 @@ class FMODGWO:
 
                 if random.random() < p_perturb:
                     new_position = self.perturb.perturb(new_position, ratio=perturb_ratio)
-                # 更新狼的位置与适应度
+                # 更新狼的位置（适应度在整代结束后批量评估）
                 wolf.Position = new_position
-                wolf.Cost = self.evaluator.evaluate(new_position)
+
+            # 整代新位置一次性批量评估
+            costs = self.evaluator.evaluate_many([wolf.Position for wolf in self.population])
+            for wolf, cost in zip(self.population, costs):
+                wolf.Cost = tuple(cost)
 
             # 更新存档
             self.archive_mgr.update(self.population)
@@ -0,0 +1,95 @@
+import math
+import numpy as np
+
+class FairnessScorer:
+    """
+    编译后的社区公平性评分（与 Evaluator.fairness 公式一致）：
+    - comm_ids[i]：下标为 i 的节点所属社区的稠密编号（int32，不在社区表中的节点为 -1）
+    - comm_sizes[c]：社区 c 的节点数（加权覆盖率的权重）
+    - total_weight：社区表中的节点总数
+    只依赖 NumPy 数组，可放入共享内存供子进程直接使用。
+    """
+
+    def __init__(self, comm_ids, comm_sizes, total_weight):
+        self.comm_ids = comm_ids
+        self.comm_sizes = comm_sizes
+        self.total_weight = total_weight
+
+    @classmethod
+    def from_mapping(cls, nodes, node_to_comm):
+        """
+        由 node_to_comm 字典构造。
+        :param nodes: 下标 → 节点编号（与 CSRGraph.nodes 对齐）
+        """
+        labels = sorted(set(node_to_comm.values()))
+        dense = {comm: i for i, comm in enumerate(labels)}
+        comm_ids = np.array([dense[node_to_comm[n]] if n in node_to_comm else -1 for n in nodes], dtype=np.int32)
+        comm_sizes = np.bincount([dense[c] for c in node_to_comm.values()], minlength=len(labels)).astype(np.float64)
+        return cls(comm_ids, comm_sizes, float(len(node_to_comm)))
+
+    def score(self, indices, w_cov=0.5, w_entropy=0.5):
+        """
+        单个种子集合的公平性。
+        :param indices: 种子节点下标数组（保留重复，与原实现的 len(seed_set) 一致）
+        """
+        if len(indices) == 0:
+            return 0.0
+
+        comms = self.comm_ids[indices]
+        counts = np.bincount(comms[comms >= 0], minlength=len(self.comm_sizes))
+        present = np.flatnonzero(counts)
+
+        # === 加权覆盖率 ===
+        coverage_score = self.comm_sizes[present].sum() / (self.total_weight + 1e-9)
+
+        # === 节点分布均衡性（信息熵） ===
+        probs = counts[present] / len(indices)
+        entropy = -np.sum(probs * np.log(probs + 1e-9))
+        max_entropy = math.log(len(present)) if len(present) else 1.0
+        entropy_score = entropy / (max_entropy + 1e-9)
+
+        return float(w_cov * coverage_score + w_entropy * entropy_score)
+
+    @staticmethod
+    def pad(index_lists, fill=-1):
+        """把若干个下标数组拼成 (B, 最大长度) 的 int32 矩阵，不足处用 fill（-1）补齐。"""
+        width = max((len(indices) for indices in index_lists), default=0)
+        matrix = np.full((len(index_lists), width), fill, dtype=np.int32)
+        for row, indices in zip(matrix, index_lists):
+            row[:len(indices)] = indices
+        return matrix
+
+    def score_many(self, index_matrix, w_cov=0.5, w_entropy=0.5):
+        """
+        批量公平性：一次 bincount 统计整个种群每个集合在各社区中的种子数。
+        :param index_matrix: (pop, budget) 种子下标矩阵，-1 为补齐位（不计入集合大小）
+        :return: 长度 pop 的公平性数组，与逐个调用 score 的结果一致
+        """
+        index_matrix = np.asarray(index_matrix, dtype=np.int64).reshape(len(index_matrix), -1)
+        pop = len(index_matrix)
+        num_comms = len(self.comm_sizes)
+
+        valid = index_matrix >= 0
+        comms = np.where(valid, self.comm_ids[np.where(valid, index_matrix, 0)], -1)
+        lengths = valid.sum(axis=1)
+
+        # === 行偏移后统一 bincount：counts[p, c] = 第 p 个集合落在社区 c 的种子数 ===
+        rows = np.broadcast_to(np.arange(pop)[:, None], comms.shape)
+        member = comms >= 0
+        counts = np.bincount(rows[member] * num_comms + comms[member],
+                             minlength=pop * num_comms).reshape(pop, num_comms)
+        present = counts > 0
+        num_present = present.sum(axis=1)
+
+        # === 加权覆盖率 ===
+        coverage_score = (present @ self.comm_sizes) / (self.total_weight + 1e-9)
+
+        # === 节点分布均衡性（信息熵） ===
+        probs = counts / np.maximum(lengths, 1)[:, None]
+        entropy = -np.sum(np.where(present, probs * np.log(probs + 1e-9), 0.0), axis=1)
+        max_entropy = np.where(num_present > 0, np.log(np.maximum(num_present, 1)), 1.0)
+        entropy_score = entropy / (max_entropy + 1e-9)
+
+        scores = w_cov * coverage_score + w_entropy * entropy_score
+        scores[lengths == 0] = 0.0
+        return scores
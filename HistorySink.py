@@ -0,0 +1,108 @@
+import os
+from collections import deque
+import numpy as np
+
+# 优化历史的流式存储：每代一条记录 (iteration, archive_costs, hv, time)，
+# 按 chunk_size 代一块写成目录下的 chunk_000000.npz、chunk_000001.npz ……（列式：
+# iteration / hv / time 为每代一个值，各代存档目标值拼接为 costs，offsets 为每代的起止位置）。
+# 内存中只保留最近 window 代，迭代次数和 run 数增长时内存占用不变。
+
+def _chunk_name(index):
+    return f"chunk_{index:06d}.npz"
+
+def _write_chunk(path, records):
+    sizes = [len(costs) for _, costs, _, _ in records]
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f,
+                 iteration=np.array([r[0] for r in records], dtype=np.int64),
+                 hv=np.array([r[2] for r in records], dtype=np.float64),
+                 time=np.array([r[3] for r in records], dtype=np.float64),
+                 offsets=np.concatenate(([0], np.cumsum(sizes))).astype(np.int64),
+                 costs=np.concatenate([r[1] for r in records]) if records else np.empty((0, 2)))
+    os.replace(tmp_path, path)
+
+def _read_chunk(path):
+    with np.load(path) as data:
+        offsets, costs = data['offsets'], data['costs']
+        return [(int(t), costs[offsets[i]:offsets[i + 1]], float(hv), float(elapsed))
+                for i, (t, hv, elapsed) in enumerate(zip(data['iteration'], data['hv'], data['time']))]
+
+def _chunk_paths(directory):
+    names = sorted(name for name in os.listdir(directory) if name.startswith('chunk_') and name.endswith('.npz'))
+    return [os.path.join(directory, name) for name in names]
+
+def iter_history(directory):
+    """逐块读取，依次产生 (iteration, archive_costs, hv, time)；任一时刻只有一块在内存中。"""
+    for path in _chunk_paths(directory):
+        yield from _read_chunk(path)
+
+def load_history(directory):
+    """
+    读取完整历史。
+    :return: {'iteration', 'hv', 'time'：每代一个值的数组；'archive_costs'：每代 (n, 2) 目标值数组的列表}
+    """
+    records = list(iter_history(directory))
+    return {
+        'iteration': np.array([r[0] for r in records], dtype=np.int64),
+        'archive_costs': [r[1] for r in records],
+        'hv': np.array([r[2] for r in records], dtype=np.float64),
+        'time': np.array([r[3] for r in records], dtype=np.float64),
+    }
+
+class HistorySink:
+    """
+    按代追加写入优化历史（见模块说明），用法：
+        with HistorySink('results/history/run1', window=10) as history:
+            optimizer.optimize(max_iter, history=history)
+    - append()：记录一代，缓冲满 chunk_size 代时写出一块；
+    - window：最近 window 代的记录（deque），供需要近期历史的调用方使用；
+    - rewind(t)：删除第 t 代及之后的记录（从检查点续跑、或从头重跑时由优化器调用）。
+    """
+
+    def __init__(self, directory, chunk_size=50, window=100):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.window = deque(maxlen=window)
+        self._buffer = []
+        self._num_chunks = len(_chunk_paths(directory))
+
+    def append(self, iteration, archive_costs, hv, elapsed):
+        record = (int(iteration), np.asarray(archive_costs, dtype=np.float64).reshape(-1, 2), float(hv), float(elapsed))
+        self.window.append(record)
+        self._buffer.append(record)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """把缓冲中的记录写成一块（不足 chunk_size 也写出，例如写检查点之前）。"""
+        if not self._buffer:
+            return
+        _write_chunk(os.path.join(self.directory, _chunk_name(self._num_chunks)), self._buffer)
+        self._num_chunks += 1
+        self._buffer = []
+
+    def rewind(self, iteration):
+        """删除 iteration 及之后各代的记录（记录按代递增，只会影响末尾的块）。"""
+        self._buffer = [r for r in self._buffer if r[0] < iteration]
+        self.window = deque((r for r in self.window if r[0] < iteration), maxlen=self.window.maxlen)
+        for path in reversed(_chunk_paths(self.directory)):
+            records = _read_chunk(path)
+            kept = [r for r in records if r[0] < iteration]
+            if len(kept) == len(records):
+                break
+            if kept:
+                _write_chunk(path, kept)
+            else:
+                os.remove(path)
+                self._num_chunks -= 1
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,127 @@
+import heapq
+import numpy as np
+from NonDominatedSort import non_dominated_mask
+
+# 双目标（最大化）超体积工具：
+# - hypervolume_2d：精确超体积，按 f1 降序排序后对 f2 做前缀最大值，O(n log n) 且全向量化；
+# - hv_contributions_2d：非支配点各自独占的超体积（从存档中删去该点后 HV 的减少量）；
+# - hv_insert_delta / hv_remove_delta：存档插入、删除一个点时 HV 的增量，只看相邻的点；
+# - hv_truncate_2d：按超体积贡献逐个删除点（堆 + 双向链表）。
+# 所有函数都把点裁剪到参考点之上（低于参考点的部分不计入）。
+
+def _clip(points, reference_point):
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    return np.maximum(points, np.asarray(reference_point, dtype=float))
+
+def hypervolume_2d(points, reference_point=(0, 0)):
+    """
+    精确的二维超体积（允许包含被支配点和重复点）。
+    :param points: (n, 2) 目标值，两个目标都越大越好
+    """
+    points = _clip(points, reference_point)
+    if len(points) == 0:
+        return 0.0
+    r1, r2 = reference_point
+    order = np.lexsort((-points[:, 1], -points[:, 0]))
+    f1 = points[order, 0]
+    ceiling = np.maximum.accumulate(points[order, 1])
+    heights = np.diff(ceiling, prepend=r2)
+    return float(np.sum((f1 - r1) * heights))
+
+def hv_contributions_2d(points, reference_point=(0, 0)):
+    """
+    每个非支配点独占的超体积（相对于非支配点集合，即从存档中删去该点后 HV 的减少量）；
+    被支配点和重复点为 0。
+    :return: 与 points 对齐的数组
+    """
+    points = _clip(points, reference_point)
+    contributions = np.zeros(len(points))
+    front = np.flatnonzero(non_dominated_mask(points))
+    if front.size == 0:
+        return contributions
+    r1, r2 = reference_point
+
+    # 非支配点按 f1 升序时 f2 降序，独占区域由左右相邻点决定
+    front = front[np.lexsort((-points[front, 1], points[front, 0]))]
+    f1, f2 = points[front, 0], points[front, 1]
+    left = np.concatenate(([r1], f1[:-1]))
+    lower = np.concatenate((f2[1:], [r2]))
+
+    contributions[front] = (f1 - left) * (f2 - lower)
+    return contributions
+
+def hv_insert_delta(point, left=None, right=None, dominated=(), reference_point=(0, 0)):
+    """
+    向非支配集合插入一个点时的 HV 增量。
+    :param point: 新点（未被集合支配）
+    :param left: 插入位置左侧（f1 更小、f2 更大）的相邻点，或与新点相同的点；没有则为 None
+    :param right: 插入位置右侧（f1 更大、f2 更小）的相邻点；没有则为 None
+    :param dominated: 被新点支配、将被移除的点
+    """
+    r1, r2 = reference_point
+    a, b = _clip([point], reference_point)[0]
+    # 新点的矩形与原有支配区域的交集是一段阶梯：左邻居截到高度 b，右邻居截到宽度 a
+    stair = [tuple(p) for p in _clip(dominated, reference_point)]
+    if left is not None:
+        stair.append((min(max(left[0], r1), a), b))
+    if right is not None:
+        stair.append((a, min(max(right[1], r2), b)))
+    return (a - r1) * (b - r2) - hypervolume_2d(stair, reference_point)
+
+def hv_remove_delta(point, left=None, right=None, reference_point=(0, 0)):
+    """
+    从非支配集合删除一个点时的 HV 增量（≤ 0），即该点独占超体积的相反数。
+    left / right 含义同 hv_insert_delta；与该点完全相同的点作为 left 传入时增量为 0。
+    """
+    r1, r2 = reference_point
+    a, b = _clip([point], reference_point)[0]
+    left_f1 = r1 if left is None else min(max(left[0], r1), a)
+    lower_f2 = r2 if right is None else min(max(right[1], r2), b)
+    return -(a - left_f1) * (b - lower_f2)
+
+def hv_truncate_2d(points, size, reference_point=(0, 0)):
+    """
+    按超体积贡献逐个删除点，直到只剩 size 个：每次删除当前独占 HV 最小的点。
+    点按 f1 升序串成双向链表，贡献放入最小堆；删除一个点后只有左右两个邻居的贡献会变化，
+    重新入堆即可（旧条目按版本号作废），每次删除 O(log n)。
+    :param points: (n, 2) 非支配点（允许重复点，重复点贡献为 0 会被优先删除）
+    :return: 保留点的下标（升序）
+    """
+    points = _clip(points, reference_point)
+    n = len(points)
+    if n <= size:
+        return list(range(n))
+    r1, r2 = reference_point
+
+    order = np.lexsort((-points[:, 1], points[:, 0])).tolist()
+    f1 = points[order, 0].tolist()
+    f2 = points[order, 1].tolist()
+    prev = list(range(-1, n - 1))
+    nxt = list(range(1, n + 1))
+    alive = [True] * n
+    version = [0] * n
+
+    def contribution(i):
+        left = f1[prev[i]] if prev[i] >= 0 else r1
+        lower = f2[nxt[i]] if nxt[i] < n else r2
+        return (f1[i] - left) * (f2[i] - lower)
+
+    heap = [(contribution(i), i, 0) for i in range(n)]
+    heapq.heapify(heap)
+    for _ in range(n - size):
+        while True:
+            _, i, v = heapq.heappop(heap)
+            if alive[i] and version[i] == v:
+                break
+        alive[i] = False
+        p, q = prev[i], nxt[i]
+        if p >= 0:
+            nxt[p] = q
+        if q < n:
+            prev[q] = p
+        for j in (p, q):
+            if 0 <= j < n:
+                version[j] += 1
+                heapq.heappush(heap, (contribution(j), j, version[j]))
+
+    return sorted(order[i] for i in range(n) if alive[i])
@@ -1,17 +1,22 @@
 import math
 import random
+import numpy as np
 from collections import defaultdict
+from CrowdingDistance import crowding_order
 
 class LeaderManager:
     """
     使用极角三分区 + 拥挤距离选择 leader1-4。
     """
 
-    def __init__(self, crowding_distance_fn):
+    def __init__(self, crowding_distance_fn=None):
         """
-        crowding_distance_fn: 函数引用，用于计算拥挤距离并返回排序后的个体列表（从高到低）。
+        crowding_distance_fn: 函数引用，用于计算拥挤距离并返回排序后的个体列表（从高到低）；
+        为 None 时直接在候选的目标值矩阵上使用 CrowdingDistance.crowding_order。
         """
         self.crowding_distance_fn = crowding_distance_fn
+        self._context = None
+        self._context_fronts = None
 
     def normalize_costs(self, wolves):
         """将目标值归一化到 [0, 1] 区间"""
@@ -36,6 +41,28 @@ class LeaderManager:
         else:
             return 'fair_zone'
 
+    def classify_regions(self, norm_costs):
+        """classify_region 的向量化版本：返回与 norm_costs 对齐的区域名数组。"""
+        norm_costs = np.asarray(norm_costs, dtype=float).reshape(-1, 2)
+        f1, f2 = norm_costs[:, 0], norm_costs[:, 1]
+        angle = np.arctan2(f2, f1)
+        regions = np.where(angle <= math.pi / 6, 'spread_zone',
+                           np.where(angle <= math.pi / 3, 'tradeoff_zone', 'fair_zone'))
+        regions[(f1 == 0) & (f2 == 0)] = 'tradeoff_zone'
+        return regions
+
+    def prepare(self, fronts, front_costs=None):
+        """
+        构造本代的 leader 上下文（区域划分、各区域最优、按拥挤距离排好的探索池只算一次）。
+        fronts 为同一个只读快照（如 ArchiveManager.get_fronts_snapshot()）时直接复用缓存。
+        :param front_costs: 与 fronts 逐层对齐的 (n, 2) 目标值数组（如 ArchiveManager.get_front_costs()）；
+                            为 None 时从各个体的 Cost 构造
+        """
+        if fronts is not self._context_fronts:
+            self._context = LeaderContext(self, fronts, front_costs)
+            self._context_fronts = fronts
+        return self._context
+
     def select_leaders_with_tradeoff_explorer(self, fronts):
         """
         多层 front 逐层扫描 + 区域划分 + 拥挤距离选探索 leader
@@ -45,74 +72,109 @@ class LeaderManager:
         - tradeoff_zone 最优
         - tradeoff_zone 中稀疏区域探索 leader
         """
+        return self.prepare(fronts).draw()
+
+    def ensure_leader_minimum(self, archive, population, required_num=4):
+        """
+        保证 archive 中至少有 required_num 个个体用于引导 leader。
+        若不足，从 population 中按传播性目标补足。
+        """
+        if len(archive) >= required_num:
+            return  # 足够，无需补充
+
+        # 按传播性（Cost[0]）降序从 population 中选出补充
+        supplement = sorted(
+            [w for w in population if w not in archive],
+            key=lambda w: -w.Cost[0]
+        )
+        needed = required_num - len(archive)
+        archive.extend(supplement[:needed])
+
+
+class LeaderContext:
+    """
+    一代内共享的 leader 选择结果（fronts 在一代内不变）：
+    - 逐层扫描 fronts，按极角区域划分，选出 spread / fair / tradeoff 三个区域的最优个体；
+    - tradeoff 区域的候选按拥挤距离排好，探索 leader 从其后半部分抽取。
+    每只狼调用 draw() 时只需随机抽取探索 leader，结果与逐只调用原始流程一致。
+    """
+
+    SORT_KEYS = {
+        'spread_zone': lambda costs: -costs[:, 0],
+        'fair_zone': lambda costs: -costs[:, 1],
+        'tradeoff_zone': lambda costs: -(costs[:, 0] + costs[:, 1]),
+    }
+
+    def __init__(self, leader_mgr, fronts, front_costs=None):
+        self.fronts = fronts
+        if front_costs is None:
+            front_costs = [np.array([w.Cost[:2] for w in front], dtype=float).reshape(-1, 2) for front in fronts]
         leaders = {}
         zone_order = ['spread_zone', 'fair_zone', 'tradeoff_zone']
-        zone_map = {'spread_zone': [], 'fair_zone': [], 'tradeoff_zone': []}
-
-        # === Step 1: 多层 fronts 扫描 + 区域划分 ===
-        for front in fronts:
-            norm_costs = self.normalize_costs(front)
-            for wolf, norm in zip(front, norm_costs):
-                region = self.classify_region(norm)
-                if region not in zone_map:
-                    continue
-                zone_map[region].append(wolf)
+        zone_map = {zone: [] for zone in zone_order}
+        zone_costs = {zone: np.empty((0, 2)) for zone in zone_order}
 
-            # Step 2: 每个区域按排序逻辑选最优（若未选过）
+        # === Step 1: 多层 fronts 扫描 + 区域划分（每层一次向量化归一化与分类） ===
+        for front, costs in zip(fronts, front_costs):
+            if len(front):
+                span = costs.max(axis=0) - costs.min(axis=0) + 1e-9
+                regions = leader_mgr.classify_regions((costs - costs.min(axis=0)) / span)
+                for zone in zone_order:
+                    members = np.flatnonzero(regions == zone)
+                    zone_map[zone].extend(front[i] for i in members)
+                    zone_costs[zone] = np.vstack((zone_costs[zone], costs[members]))
+
+            # Step 2: 每个区域按排序逻辑选最优（若未选过；稳定排序，与原实现的 list.sort 一致）
             for zone in zone_order:
-                if zone in leaders:
+                if zone in leaders or not zone_map[zone]:
                     continue
-                if zone_map[zone]:
-                    sort_key = {
-                        'spread_zone': lambda w: -w.Cost[0],
-                        'fair_zone': lambda w: -w.Cost[1],
-                        'tradeoff_zone': lambda w: -(w.Cost[0] + w.Cost[1])
-                    }
-                    zone_map[zone].sort(key=sort_key[zone])
-                    leaders[zone] = zone_map[zone][0]
+                order = np.argsort(self.SORT_KEYS[zone](zone_costs[zone]), kind='stable')
+                zone_map[zone] = [zone_map[zone][i] for i in order]
+                zone_costs[zone] = zone_costs[zone][order]
+                leaders[zone] = zone_map[zone][0]
 
             if len(leaders) >= 3:
                 break  # 三个主 leader 已选够
 
-        # === Step 3: Leader4 - 从 tradeoff_zone 中选择稀疏区域个体 ===
+        # === Step 3: Leader4 候选 - tradeoff_zone 按拥挤距离排序后的后半部分 ===
         tradeoff_pool = zone_map['tradeoff_zone']
+        self.explorer_pool = None
         if len(tradeoff_pool) > 1:
-            ranked = self.crowding_distance_fn(tradeoff_pool)
-            explorer = random.choice(ranked[len(ranked) // 2:])  # 从拥挤度低的后半部分选
+            if leader_mgr.crowding_distance_fn is None:
+                ranked = [tradeoff_pool[i] for i in crowding_order(zone_costs['tradeoff_zone'])]
+            else:
+                ranked = leader_mgr.crowding_distance_fn(tradeoff_pool)
+            self.explorer_pool = ranked[len(ranked) // 2:]
         elif tradeoff_pool:
-            explorer = tradeoff_pool[0]
+            self.explorer_pool = [tradeoff_pool[0]]
         else:
             all_pool = [w for front in fronts for w in front if w not in leaders.values()]
-            explorer = random.choice(all_pool) if all_pool else None
+            self.explorer_pool = all_pool or None
+
+        self.leaders = [leaders.get('spread_zone'), leaders.get('fair_zone'), leaders.get('tradeoff_zone')]
+        self._single_explorer = len(tradeoff_pool) == 1
+
+    def draw(self):
+        """为一只狼抽取 4 个 leader（前 3 个固定，探索 leader 随机）。"""
+        if self.explorer_pool is None:
+            explorer = None
+        elif self._single_explorer:
+            explorer = self.explorer_pool[0]
+        else:
+            explorer = random.choice(self.explorer_pool)
 
         # === Step 4: 补全 leader 并返回 ===
-        final_leaders = [leaders.get('spread_zone'), leaders.get('fair_zone'), leaders.get('tradeoff_zone'), explorer]
+        final_leaders = self.leaders + [explorer]
 
         # 若不足 4 个有效个体，补充已有或随机
         for i in range(4):
             if final_leaders[i] is None:
-                pool = [w for front in fronts for w in front if w not in final_leaders and w is not None]
+                pool = [w for front in self.fronts for w in front if w not in final_leaders and w is not None]
                 final_leaders[i] = random.choice(pool) if pool else random.choice(
                     [l for l in final_leaders if l is not None])
 
         return final_leaders[0], final_leaders[1], final_leaders[2], final_leaders[3]
 
-    def ensure_leader_minimum(self, archive, population, required_num=4):
-        """
-        保证 archive 中至少有 required_num 个个体用于引导 leader。
-        若不足，从 population 中按传播性目标补足。
-        """
-        if len(archive) >= required_num:
-            return  # 足够，无需补充
-
-        # 按传播性（Cost[0]）降序从 population 中选出补充
-        supplement = sorted(
-            [w for w in population if w not in archive],
-            key=lambda w: -w.Cost[0]
-        )
-        needed = required_num - len(archive)
-        archive.extend(supplement[:needed])
-
 
 # import random
 # import copy
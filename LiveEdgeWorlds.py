@@ -0,0 +1,184 @@
+import numpy as np
+from collections import OrderedDict
+from CSRGraph import unique_keys
+
+class LiveEdgeWorlds:
+    """
+    预采样的 live-edge 世界（公共随机数）：
+    - 构造时对每条有向边在 R 个世界中各抽一次硬币（成功概率 prob）；
+    - 每条边的 R 个结果按位压缩为 ceil(R/64) 个 uint64（live_bits[arc, word]）；
+    - 查询种子集合的传播 = 在每个固定世界里从种子出发、沿 live 边走至多 max_steps 步的可达节点数。
+    与 IC 模型等价：节点在第 t 轮被激活 ⇔ 它到种子集合的 live 最短路径长度为 t。
+    同一种子集合的多次查询结果完全一致，不同个体之间的比较使用同一组随机世界。
+    批量查询默认使用按位并行内核：64 个世界共用一个 uint64 状态字，
+    小种子集合在大图上的评估时间基本只取决于被触达的节点数。
+    """
+
+    MAX_CELLS = 1 << 25
+    NODE_REACH_MEMO = 4096
+    KERNELS = ('frontier', 'bitparallel')
+
+    def __init__(self, csr, num_worlds=100, prob=0.1, seed=None, kernel='bitparallel'):
+        if kernel not in self.KERNELS:
+            raise ValueError(f"Unknown reach kernel: {kernel}")
+        self.csr = csr
+        self.num_worlds = num_worlds
+        self.prob = prob
+        self.kernel = kernel
+        self.num_words = (num_worlds + 63) // 64
+
+        # === 逐世界抽样，按位写入 live_bits ===
+        rng = np.random.default_rng(seed)
+        self.live_bits = np.zeros((csr.num_arcs, self.num_words), dtype=np.uint64)
+        for world in range(num_worlds):
+            word, bit = divmod(world, 64)
+            live = rng.random(csr.num_arcs) < prob
+            self.live_bits[live, word] |= np.uint64(1 << bit)
+
+        # 单节点可达集记忆（增量评估反复用到同一批节点）
+        self._node_reach = OrderedDict()
+
+    @classmethod
+    def from_arrays(cls, csr, live_bits, num_worlds, prob, kernel='bitparallel'):
+        """由已采样好的 live_bits（如共享内存中的数组）直接构造，不重新抽样。"""
+        worlds = cls.__new__(cls)
+        worlds.csr = csr
+        worlds.num_worlds = num_worlds
+        worlds.prob = prob
+        worlds.kernel = kernel
+        worlds.num_words = live_bits.shape[1]
+        worlds.live_bits = live_bits
+        worlds._node_reach = OrderedDict()
+        return worlds
+
+    def is_live(self, world, arcs):
+        """批量查询：第 world 个世界中边 arcs 是否为 live（world 与 arcs 等长）。"""
+        if self.num_words == 1:
+            words = self.live_bits[arcs, 0]
+        else:
+            words = self.live_bits[arcs, world >> 6]
+        return ((words >> (world & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+    def reach_many(self, seed_index_lists, max_steps=2):
+        """
+        对 B 个种子集合，在全部 R 个世界中做受 max_steps 限制的 BFS。
+        kernel='bitparallel'（默认）使用按位并行内核 _bfs_bits；'frontier' 使用逐世界展开的 _bfs，两者结果完全相同。
+        :return: (B, R) 的可达节点数矩阵
+        """
+        n = self.csr.num_nodes
+        R = self.num_worlds
+        num_sets = len(seed_index_lists)
+
+        if self.kernel == 'bitparallel':
+            # 每个集合最坏情况下展开全部出边（每条约 num_words 个字的中间数组），
+            # 解包计数时每个 (集合, 节点) 占 num_words * 64 字节
+            chunk = max(1, self.MAX_CELLS // (8 * self.num_words * (self.csr.num_arcs + 8 * n)))
+            return np.vstack([self._count_bits(self._bfs_bits(seed_index_lists[i:i + chunk], max_steps))
+                              for i in range(0, num_sets, chunk)]) if num_sets else np.zeros((0, R), dtype=np.int64)
+
+        # 种群较大时分块，控制 reached 布尔矩阵的内存（约 MAX_CELLS 字节）
+        chunk = max(1, self.MAX_CELLS // (R * n))
+        if num_sets > chunk:
+            return np.vstack([self.reach_many(seed_index_lists[i:i + chunk], max_steps)
+                              for i in range(0, num_sets, chunk)])
+
+        reached = self._bfs(seed_index_lists, max_steps)
+        return reached.reshape(num_sets, R, n).sum(axis=2)
+
+    def node_reach(self, node, max_steps=2):
+        """
+        单个种子节点在全部世界中的可达集，返回扁平键 world * N + node（升序、无重复）。
+        由于截断 BFS 的可达集满足 reach(S) = ∪_{s∈S} reach({s})，
+        增量评估只需对增删的节点调用本方法。
+        """
+        key = (int(node), max_steps)
+        if key in self._node_reach:
+            self._node_reach.move_to_end(key)
+            return self._node_reach[key]
+        keys = np.flatnonzero(self._bfs([[node]], max_steps))
+        self._node_reach[key] = keys
+        if len(self._node_reach) > self.NODE_REACH_MEMO:
+            self._node_reach.popitem(last=False)
+        return keys
+
+    def _bfs(self, seed_index_lists, max_steps):
+        """在全部世界中并行做截断 BFS，返回展平的 (B * R * N) 可达布尔数组。"""
+        n = self.csr.num_nodes
+        R = self.num_worlds
+        reached = np.zeros(len(seed_index_lists) * R * n, dtype=bool)
+
+        # === 初始 frontier：任务 b * R + r 表示第 b 个种子集合在世界 r 中的 BFS ===
+        tasks, frontiers = [], []
+        for b, seed_indices in enumerate(seed_index_lists):
+            seeds = np.unique(np.asarray(seed_indices, dtype=np.int64))
+            tasks.append(np.repeat(np.arange(b * R, (b + 1) * R, dtype=np.int64), len(seeds)))
+            frontiers.append(np.tile(seeds, R))
+        task = np.concatenate(tasks) if tasks else np.empty(0, dtype=np.int64)
+        frontier = np.concatenate(frontiers) if frontiers else np.empty(0, dtype=np.int64)
+        reached[task * n + frontier] = True
+
+        for _ in range(max_steps):
+            task, arcs = self.csr.expand(task, frontier)
+            if arcs.size == 0:
+                break
+            # 不再抽随机数：直接查表判断该世界中边是否 live
+            live = self.is_live(task % R, arcs)
+            keys = task[live] * n + self.csr.indices[arcs[live]]
+            keys = unique_keys(keys[~reached[keys]])
+            if keys.size == 0:
+                break
+            reached[keys] = True
+            task, frontier = np.divmod(keys, n)
+
+        return reached
+
+    def _bfs_bits(self, seed_index_lists, max_steps):
+        """
+        按位并行的截断 BFS：每个 (种子集合, 节点) 的状态是 num_words 个 uint64，
+        第 r 位表示该节点在世界 r 中已被激活，64 个世界共用一个机器字。
+        每一轮只展开 frontier 节点的出边：出边贡献 = 源节点 frontier 字 & 该边的 live 字，
+        再按 (集合, 目标节点) 排序后用 bitwise_or.reduceat 合并。
+        :return: (B * N, num_words) 的 reached 位矩阵
+        """
+        n = self.csr.num_nodes
+        W = self.num_words
+        reached = np.zeros((len(seed_index_lists) * n, W), dtype=np.uint64)
+
+        # 只有前 R 位是有效世界
+        full = np.full(W, np.uint64(0xFFFFFFFFFFFFFFFF))
+        if self.num_worlds % 64:
+            full[-1] = np.uint64((1 << (self.num_worlds % 64)) - 1)
+
+        rows = [b * n + np.unique(np.asarray(seeds, dtype=np.int64)) for b, seeds in enumerate(seed_index_lists)]
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        reached[rows] = full
+        words = reached[rows]
+
+        for _ in range(max_steps):
+            owner, arcs = self.csr.expand(np.arange(rows.size, dtype=np.int64), rows % n)
+            if arcs.size == 0:
+                break
+            contrib = words[owner] & self.live_bits[arcs]
+            keep = contrib.any(axis=1)
+            keys = (rows[owner[keep]] // n) * n + self.csr.indices[arcs[keep]]
+            if keys.size == 0:
+                break
+            order = np.argsort(keys, kind='stable')
+            keys = keys[order]
+            starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+            merged = np.bitwise_or.reduceat(contrib[keep][order], starts, axis=0)
+            rows = keys[starts]
+            words = merged & ~reached[rows]
+            keep = words.any(axis=1)
+            rows, words = rows[keep], words[keep]
+            if rows.size == 0:
+                break
+            reached[rows] |= words
+
+        return reached
+
+    def _count_bits(self, reached):
+        """把 (B * N, num_words) 位矩阵还原为 (B, R) 的每世界可达节点数。"""
+        n = self.csr.num_nodes
+        bits = np.unpackbits(reached.view(np.uint8), axis=1, bitorder='little')
+        return bits.reshape(-1, n, self.num_words * 64).sum(axis=1, dtype=np.int64)[:, :self.num_worlds]
@@ -1,4 +1,5 @@
 import numpy as np
+from Hypervolume import hypervolume_2d
 
 
 class EmptyGrid:
@@ -27,23 +28,9 @@ def createHypercubes(costs, ngrid, alpha):
     return G
 
 def calculate_hypervolume_2d(archiveCosts):
-    pf = archiveCosts#archive_cost = number of grey wolves * number of fitness function
-    repoint=np.zeros(pf.shape[0]) # maximize问题，参考点设置为0,0，求谁的面积最大
-    popsize = pf.shape[1]#pf的列数，即archivecost中grey wolf的个数
-    temp_index = np.argsort(pf[0,:])# 对帕累托前沿解集的第一行（第一个目标）进行升序排序
-    sorted_pf = pf[:,temp_index]
-    # 将参考点与排序后的帕累托前沿解集合并
-    pointset = np.hstack([repoint.reshape(-1, 1), sorted_pf])
-    # 初始化超体积为0
-    hyp = 0.0
-    if popsize == 1:
-        point = pf[:,0]
-        hyp = np.prod(point - repoint)
-    else:
-        for i in range(popsize-1):
-            cubei = (pointset[1, i + 1] - pointset[0, 0]) * (pointset[0, i + 1] - pointset[0, i])
-            hyp += cubei
-    return hyp
+    pf = np.asarray(archiveCosts)#archive_cost = number of fitness function * number of grey wolves
+    # maximize问题，参考点设置为0,0，求谁的面积最大
+    return hypervolume_2d(pf.T, reference_point=(0, 0))
 
 def calculate_hypervolume(archiveCosts):
     pf = np.array(archiveCosts)
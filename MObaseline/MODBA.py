@@ -4,12 +4,13 @@ import paretosolution as ps
 import time
 from copy import deepcopy
 from Evaluator import *
+from ParetoArchive import ParetoArchive
 
 def sigmoid_mapping(velocity):
     return 1 / (1 + np.exp(-velocity))
 
 class MODBA:
-    def __init__(self, graph, budget, pop_size, archive_size, node_to_comm, total_communities):
+    def __init__(self, graph, budget, pop_size, archive_size, node_to_comm, total_communities, evaluator=None):
         self.graph = graph
         self.budget = budget
         self.pop_size = pop_size
@@ -17,7 +18,7 @@ class MODBA:
         self.node_to_comm = node_to_comm
         self.total_communities = total_communities
         self.total_nodes = len(graph.nodes)
-        self.evaluator = Evaluator(graph, node_to_comm, total_communities)
+        self.evaluator = evaluator if evaluator is not None else Evaluator(graph, node_to_comm, total_communities)
 
     def optimize(self, max_iter):
         Q_min, Q_max = 0.5, 1.5
@@ -32,62 +33,76 @@ class MODBA:
         r = np.full(n_bats, r_init)
 
         bats = [random.sample(list(self.graph.nodes), self.budget) for _ in range(n_bats)]
-        archive = []
+        archive = ParetoArchive(self.archive_size)  # 增量式 Pareto 存档，逐只插入为 O(log n + k)
         reference_point = [0, 0]  # Adjust to [0, 0, 0] for 3 objectives
         final_HV = []
         each_group_time = []
         all_solutions = []
 
-        for bat in bats:
-            fitness = self.evaluator.evaluate(bat)
-            archive = ps.update_elite_archive(archive, [(bat, fitness)], self.archive_size)
+        try:
+            fitnesses = self.evaluator.evaluate_many(bats)
+            for bat, fitness in zip(bats, fitnesses):
+                archive.add(bat, tuple(fitness))
 
-        print("Initialization finished.")
+            print("Initialization finished.")
 
-        for t in range(max_iter):
-            print(f"Iteration {t + 1}")
-            start_time = time.time()
-            new_solutions = []
+            for t in range(max_iter):
+                print(f"Iteration {t + 1}")
+                start_time = time.time()
+                new_solutions = []
+                new_bats = []
 
-            for i in range(n_bats):
-                Q[i] = np.random.uniform(Q_min, Q_max)
-                leader = archive[0][0] if archive else bats[i]
+                # === 生成整代新位置（leader 取自本代开始时的存档，与列表存档相同取第一个解） ===
+                first = archive.ordered()[0][0] if archive else None
+                for i in range(n_bats):
+                    Q[i] = np.random.uniform(Q_min, Q_max)
+                    leader = first if first is not None else bats[i]
 
-                xi = np.array([1 if node in bats[i] else 0 for node in range(self.total_nodes)])
-                x0 = np.array([1 if node in leader else 0 for node in range(self.total_nodes)])
-                v[i] += (xi ^ x0) * Q[i]
+                    xi = np.array([1 if node in bats[i] else 0 for node in range(self.total_nodes)])
+                    x0 = np.array([1 if node in leader else 0 for node in range(self.total_nodes)])
+                    v[i] += (xi ^ x0) * Q[i]
 
-                probabilities = sigmoid_mapping(v[i])
-                new_bat = [node for node, prob in enumerate(probabilities) if random.random() < prob]
+                    probabilities = sigmoid_mapping(v[i])
+                    new_bat = [node for node, prob in enumerate(probabilities) if random.random() < prob]
 
-                if len(new_bat) > self.budget:
-                    new_bat = random.sample(new_bat, self.budget)
-                elif len(new_bat) < self.budget:
-                    additional = list(set(self.graph.nodes) - set(new_bat))
-                    new_bat += random.sample(additional, self.budget - len(new_bat))
+                    if len(new_bat) > self.budget:
+                        new_bat = random.sample(new_bat, self.budget)
+                    elif len(new_bat) < self.budget:
+                        additional = list(set(self.graph.nodes) - set(new_bat))
+                        new_bat += random.sample(additional, self.budget - len(new_bat))
 
-                if random.random() > r[i]:
-                    new_bat = mutation_operator(new_bat, self.graph)
-                else:
-                    new_bat = turbulence_operator(new_bat, self.graph)
+                    if random.random() > r[i]:
+                        new_bat = mutation_operator(new_bat, self.graph)
+                    else:
+                        new_bat = turbulence_operator(new_bat, self.graph)
 
-                new_fitness = self.evaluator.evaluate(new_bat)
+                    new_bats.append(new_bat)
 
-                if random.random() < A[i]:
-                    bats[i] = new_bat
-                    archive = ps.update_elite_archive(archive, [(new_bat, new_fitness)], self.archive_size)
+                # === 整代新位置一次性批量评估 ===
+                new_fitnesses = self.evaluator.evaluate_many(new_bats)
 
-                A[i] = max(A[i] * alpha, A_min)
-                r[i] = min(r[i] * (1 - np.exp(-gamma * t)), r_max)
+                for i in range(n_bats):
+                    new_bat, new_fitness = new_bats[i], tuple(new_fitnesses[i])
 
-                new_solutions.append((bats[i], new_fitness))
+                    if random.random() < A[i]:
+                        bats[i] = new_bat
+                        archive.add(new_bat, new_fitness)
 
-            archive = ps.update_elite_archive(archive, new_solutions, self.archive_size)
+                    A[i] = max(A[i] * alpha, A_min)
+                    r[i] = min(r[i] * (1 - np.exp(-gamma * t)), r_max)
 
-            hv_value = ps.calculate_hypervolume(archive, reference_point)
-            final_HV.append(hv_value)
-            each_group_time.append(time.time() - start_time)
+                    new_solutions.append((bats[i], new_fitness))
 
+                archive.update(new_solutions)
+
+                hv_value = ps.calculate_hypervolume(archive, reference_point)
+                final_HV.append(hv_value)
+                each_group_time.append(time.time() - start_time)
+        finally:
+            # 异常或中断时同样关闭评估器（进程池 / 共享内存）
+            self.evaluator.close()
+
+        archive = archive.ordered()
         all_solutions.append((deepcopy(archive), deepcopy(each_group_time)))
         return archive, all_solutions, final_HV, each_group_time
 
@@ -13,9 +13,10 @@ from ArchiveManager import *
 import time
 from copy import deepcopy
 from Evaluator import *
+from ParetoArchive import ParetoArchive
 
 class MODPSO:
-    def __init__(self, graph, budget, num_particles, archive_size, node_to_community, total_communities):
+    def __init__(self, graph, budget, num_particles, archive_size, node_to_community, total_communities, evaluator=None):
         """
         多目标离散粒子群优化
         """
@@ -30,14 +31,14 @@ class MODPSO:
         self.velocities = []  # 粒子速度（添加或移除操作）
         self.pbest = []  # 个体最优位置
         self.pbest_fitness = []  # 个体最优适应度
-        self.archive = []  # Pareto 存档
+        self.archive = ParetoArchive(archive_size)  # Pareto 存档（增量插入）
         self.gbest = None  # 全局最优位置
         self.gbest_fitness = None  # 全局最优适应度
         self.start_time = []
         self.end_time = []
         self.Time = []
 
-        self.evaluator = Evaluator(self.graph, self.node_to_community, self.total_communities)
+        self.evaluator = evaluator if evaluator is not None else Evaluator(self.graph, self.node_to_community, self.total_communities)
 
     def initialize_particles(self):
 
@@ -52,13 +53,18 @@ class MODPSO:
             # 初始化速度为空
             self.velocities.append([])
 
+        # 整个粒子群一次性批量评估
+        fitnesses = self.evaluator.evaluate_many(self.particles)
+
+        for particle, fitness in zip(self.particles, fitnesses):
+            fitness = tuple(fitness)
+
             # 初始化个体最优解为当前解
             self.pbest.append(particle)
-            fitness = self.evaluator.evaluate(particle)
             self.pbest_fitness.append(fitness)
 
             # 更新 Pareto 档案
-            self.archive = ps.update_elite_archive(self.archive, [(particle, fitness)], self.archive_size)
+            self.archive.add(particle, fitness)
 
     def select_gbest(self):
         """
@@ -117,7 +123,9 @@ class MODPSO:
         局部搜索：在粒子邻域中寻找支配当前解的邻居。
         每次只替换一个节点，若改进则接受。
         """
-        particle_fitness = self.evaluator.evaluate(particle)
+        # 保留父状态，邻域候选只增量重算被替换的两个节点
+        state = self.evaluator.evaluate_state(particle)
+        particle_fitness = state.cost
         improved = True
 
         while improved:
@@ -130,11 +138,12 @@ class MODPSO:
                     if neighbor not in particle:
                         candidate = particle[:]
                         candidate[idx] = neighbor
-                        candidate_fitness = self.evaluator.evaluate(candidate)
+                        candidate_fitness = self.evaluator.delta_cost(state, add=[neighbor], remove=[node])
 
                         if ps.dominates(candidate_fitness, particle_fitness):
                             particle = candidate
                             particle_fitness = candidate_fitness
+                            state = self.evaluator.evaluate_delta(state, add=[neighbor], remove=[node])
                             improved = True
                             break  # 局部改进立即接受
                 if improved:
@@ -150,44 +159,51 @@ class MODPSO:
         final_HV = []
         reference_point = [0, 0]
         print("optimization start")
-        self.initialize_particles()
+        try:
+            self.initialize_particles()
+
+            for iteration in range(max_iterations):
+                new_solutions = []
+                self.start_time = time.time()
+                gbest_position, _ = self.select_gbest()
 
-        for iteration in range(max_iterations):
-            new_solutions = []
-            self.start_time = time.time()
-            gbest_position, _ = self.select_gbest()
+                for i in range(self.num_particles):
+                    # 更新速度和位置
+                    self.update_velocity(i, set(gbest_position))
+                    self.update_position(i)
 
-            for i in range(self.num_particles):
-                # 更新速度和位置
-                self.update_velocity(i, set(gbest_position))
-                self.update_position(i)
+                # 整代新位置一次性批量评估适应度
+                fitnesses = self.evaluator.evaluate_many(self.particles)
 
-                # 评估新位置的适应度
-                fitness = self.evaluator.evaluate(self.particles[i])
-                # # 局部搜索优化
-                # self.particles[i] , fitness = self.local_search(self.particles[i], node_preferences, num_information, node_to_community, total_nodes,
-                #              total_communities)
+                for i in range(self.num_particles):
+                    fitness = tuple(fitnesses[i])
+                    # # 局部搜索优化
+                    # self.particles[i] , fitness = self.local_search(self.particles[i], node_preferences, num_information, node_to_community, total_nodes,
+                    #              total_communities)
 
-                # 更新个体最优解
-                if ps.dominates(fitness, self.pbest_fitness[i]):
-                    self.pbest[i] = self.particles[i]
-                    self.pbest_fitness[i] = fitness
+                    # 更新个体最优解
+                    if ps.dominates(fitness, self.pbest_fitness[i]):
+                        self.pbest[i] = self.particles[i]
+                        self.pbest_fitness[i] = fitness
 
-                # 添加到新解集合
-                new_solutions.append((self.particles[i], fitness))
+                    # 添加到新解集合
+                    new_solutions.append((self.particles[i], fitness))
 
-                # 更新 Pareto 档案
-            self.archive = ps.update_elite_archive(self.archive, new_solutions, self.archive_size)
+                    # 更新 Pareto 档案
+                self.archive.update(new_solutions)
 
-            print(f"Iteration {iteration + 1}: Archive Size = {len(self.archive)}")
+                print(f"Iteration {iteration + 1}: Archive Size = {len(self.archive)}")
 
-            # Calculate hypervolume for this iteration
-            final_hv_value = ps.calculate_hypervolume(self.archive, reference_point)
-            final_HV.append(final_hv_value)
+                # Calculate hypervolume for this iteration
+                final_hv_value = ps.calculate_hypervolume(self.archive, reference_point)
+                final_HV.append(final_hv_value)
 
-            # Record iteration time
-            self.end_time = time.time()
-            self.Time.append(self.end_time - self.start_time)
+                # Record iteration time
+                self.end_time = time.time()
+                self.Time.append(self.end_time - self.start_time)
+        finally:
+            # 异常或中断时同样关闭评估器（进程池 / 共享内存）
+            self.evaluator.close()
 
-        all_solutions.append((deepcopy(self.archive), deepcopy(self.Time)))
+        all_solutions.append((deepcopy(list(self.archive)), deepcopy(self.Time)))
         return all_solutions, final_HV
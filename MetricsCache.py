@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from StructureMetrics import StructureMetrics
+
+# 结构指标的磁盘缓存：以边文件内容的 sha256 加计算参数为键，
+# 每个条目是 <数据集目录>/metrics_cache/<文件哈希>-<参数哈希>/ 下的一组 .npy 文件，
+# 读取时内存映射（np.load(mmap_mode='r')），边文件内容变化后旧条目自动失效并被删除。
+
+FORMAT_VERSION = 2
+
+def file_digest(path):
+    """文件内容的 sha256（十六进制）。"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class MetricsCache:
+    def __init__(self, edges_file, cache_dir=None):
+        """
+        :param edges_file: 数据集的边文件（缓存键的一部分）
+        :param cache_dir: 缓存目录，默认为边文件所在目录（与 communities.txt 同级）下的 metrics_cache
+        """
+        self.edges_file = edges_file
+        self.cache_dir = cache_dir if cache_dir is not None else os.path.join(os.path.dirname(edges_file), 'metrics_cache')
+        self.file_hash = file_digest(edges_file)[:16]
+
+    def entry(self, params):
+        """参数对应的条目目录。"""
+        blob = json.dumps({'format': FORMAT_VERSION, **params}, sort_keys=True).encode()
+        return os.path.join(self.cache_dir, f"{self.file_hash}-{hashlib.sha256(blob).hexdigest()[:16]}")
+
+    def load(self, params):
+        """读取条目，返回 {名称: 内存映射数组}；不存在时返回 None。"""
+        path = self.entry(params)
+        if not os.path.isdir(path):
+            return None
+        return {name[:-4]: np.load(os.path.join(path, name), mmap_mode='r')
+                for name in os.listdir(path) if name.endswith('.npy')}
+
+    def save(self, params, arrays):
+        """写入条目：先写到临时目录再整体改名，中断时不会留下不完整的条目。"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.prune()
+        tmp_path = tempfile.mkdtemp(prefix='.tmp-', dir=self.cache_dir)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(array))
+        path = self.entry(params)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+
+    def prune(self):
+        """删除边文件内容已变化的旧条目以及中断残留的临时目录。"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if not name.startswith(f"{self.file_hash}-"):
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+def load_structure_metrics(graph, edges_file, cache_dir=None, **params):
+    """
+    带磁盘缓存的 StructureMetrics：命中时直接由内存映射数组恢复，否则计算后写入缓存。
+    :param params: StructureMetrics 的计算参数（closeness / epsilon / seed）
+    """
+    cache = MetricsCache(edges_file, cache_dir)
+    params = StructureMetrics.parameters(**params)
+    arrays = cache.load(params)
+    expected = ('nodes', 'indptr', 'indices', 'degree', 'closeness', 'eigenvector')
+    if arrays is not None and all(name in arrays for name in expected) \
+            and np.array_equal(arrays['nodes'], list(graph.nodes())):
+        return StructureMetrics.from_arrays(graph, arrays, params)
+
+    metrics = StructureMetrics(graph, **params)
+    cache.save(params, metrics.to_arrays())
+    return metrics
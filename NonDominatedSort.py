@@ -0,0 +1,42 @@
+import bisect
+import numpy as np
+
+# 双目标（最大化）非支配排序：按 f1 降序、f2 降序扫描一遍，逐个放入第一个不支配它的前沿。
+# 同一前沿内按 f1 降序加入的解 f2 严格递增，因此只需比较每个前沿最后加入的解；
+# 各前沿最后一个解的 f2 随层次单调不增，可用二分查找定位，总复杂度 O(N log N)。
+
+def non_dominated_sort(costs):
+    """
+    双目标非支配分层。
+    :param costs: (N, 2) 的目标值（列表或数组），两个目标都越大越好
+    :return: 前沿列表，fronts[k] 为第 k 层解的下标（升序）；完全相同的解位于同一层
+    """
+    costs = np.asarray(costs, dtype=float).reshape(-1, 2)
+    f1, f2 = costs[:, 0], costs[:, 1]
+    order = np.lexsort((-f2, -f1))
+
+    fronts = []
+    neg_last_f2 = []  # 各前沿最后加入的解的 -f2（单调不减，供 bisect 使用）
+    last = []         # 各前沿最后加入的解的下标
+    for i in order.tolist():
+        k = bisect.bisect_right(neg_last_f2, -f2[i])
+        # 与上一层最后的解完全相同时，同属上一层
+        if k > 0 and f1[last[k - 1]] == f1[i] and f2[last[k - 1]] == f2[i]:
+            k -= 1
+        if k == len(fronts):
+            fronts.append([])
+            neg_last_f2.append(0.0)
+            last.append(-1)
+        fronts[k].append(i)
+        neg_last_f2[k] = -f2[i]
+        last[k] = i
+
+    return [sorted(front) for front in fronts]
+
+def non_dominated_mask(costs):
+    """第一层（非支配解）的布尔掩码。"""
+    costs = np.asarray(costs, dtype=float).reshape(-1, 2)
+    mask = np.zeros(len(costs), dtype=bool)
+    if len(costs):
+        mask[non_dominated_sort(costs)[0]] = True
+    return mask
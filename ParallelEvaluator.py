@@ -0,0 +1,131 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from Evaluator import Evaluator
+from CSRGraph import CSRGraph
+from CascadeSimulator import CascadeSimulator
+from LiveEdgeWorlds import LiveEdgeWorlds
+from FairnessScorer import FairnessScorer
+
+# 子进程内的只读状态（由 _init_worker 从共享内存挂载）
+_worker = {}
+
+def _init_worker(specs, backend, simulations, prob, total_weight):
+    """子进程初始化：按名字挂载共享内存中的数组，构造 CSR / 公平性评分器。"""
+    arrays = {}
+    _worker['shm'] = []  # 保持引用，防止共享内存被提前释放
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _worker['shm'].append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    csr = CSRGraph.from_arrays(arrays['indptr'], arrays['indices'])
+    _worker['backend'] = backend
+    _worker['simulations'] = simulations
+    _worker['csr'] = csr
+    _worker['fairness'] = FairnessScorer(arrays['comm_ids'], arrays['comm_sizes'], total_weight)
+    if backend == 'live_edge':
+        _worker['worlds'] = LiveEdgeWorlds.from_arrays(csr, arrays['live_bits'], simulations, prob)
+
+def _evaluate_chunk(task):
+    """评估一个块：task = (随机种子, 种子下标数组列表)，返回 (平均激活数, 公平性)。"""
+    task_seed, index_lists = task
+    if _worker['backend'] == 'live_edge':
+        avg_activated = _worker['worlds'].reach_many(index_lists).mean(axis=1)
+    else:
+        simulator = CascadeSimulator(_worker['csr'], seed=task_seed)
+        avg_activated = simulator.simulate_many(index_lists, _worker['simulations']).mean(axis=1)
+    fairness = _worker['fairness'].score_many(FairnessScorer.pad(index_lists))
+    return avg_activated, fairness
+
+class ParallelEvaluator(Evaluator):
+    """
+    多进程并行评估器（接口与 Evaluator 相同）：
+    - 图的 CSR 数组、社区编号（live_edge 模式下还有 live_bits）放入 multiprocessing.shared_memory，
+      子进程启动时按名字挂载，不再 pickle networkx 图；
+    - evaluate_many 把种群按 chunk_size 切块分发到进程池；
+    - 每个块的随机种子由 (seed, 批次序号, 块序号) 派生，结果与进程数和调度顺序无关；
+    - 用完后调用 close() 释放进程池与共享内存（优化器在 optimize() 结束时调用）。
+    """
+
+    def __init__(self, graph, node_to_comm, total_communities, workers=None, chunk_size=4,
+                 num_information=1, simulations=10, backend='csr', seed=None, cache_size=None):
+        if backend not in ('csr', 'live_edge'):
+            raise ValueError(f"ParallelEvaluator does not support backend: {backend}")
+        super().__init__(graph, node_to_comm, total_communities, num_information=num_information,
+                         simulations=simulations, backend=backend, seed=seed, cache_size=cache_size)
+        self.chunk_size = chunk_size
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.batch_counter = 0
+
+        # === 把只读数组复制进共享内存 ===
+        arrays = {
+            'indptr': self.csr.indptr,
+            'indices': self.csr.indices,
+            'comm_ids': self.fairness_scorer.comm_ids,
+            'comm_sizes': self.fairness_scorer.comm_sizes,
+        }
+        if backend == 'live_edge':
+            arrays['live_bits'] = self.worlds.live_bits
+
+        self._shm = []
+        specs = {}
+        for key, arr in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._shm.append(shm)
+            specs[key] = (shm.name, arr.shape, arr.dtype.str)
+
+        prob = self.worlds.prob if backend == 'live_edge' else None
+        self.pool = mp.Pool(workers, initializer=_init_worker,
+                            initargs=(specs, backend, simulations, prob, self.fairness_scorer.total_weight))
+
+    def _evaluate_batch(self, seed_sets):
+        """把种群切块分发到进程池；进程池关闭后退回单进程评估。"""
+        if self.pool is None:
+            return super()._evaluate_batch(seed_sets)
+
+        index_lists = [self.csr.to_indices(seed_set) for seed_set in seed_sets]
+        tasks = []
+        for k, start in enumerate(range(0, len(index_lists), self.chunk_size)):
+            task_seed = np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(self.batch_counter, k))
+            tasks.append((task_seed, index_lists[start:start + self.chunk_size]))
+        self.batch_counter += 1
+
+        results = np.empty((len(seed_sets), 2))
+        start = 0
+        for avg_activated, fairness in self.pool.map(_evaluate_chunk, tasks):
+            end = start + len(fairness)
+            results[start:end, 0] = avg_activated / self.total_nodes
+            results[start:end, 1] = fairness
+            start = end
+        return results
+
+    def get_state(self):
+        """在单进程状态之外记录派生任务种子所用的熵与批次序号。"""
+        state = super().get_state()
+        state['entropy'] = self.seed_sequence.entropy
+        state['batch_counter'] = self.batch_counter
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        self.seed_sequence = np.random.SeedSequence(state['entropy'])
+        self.batch_counter = state['batch_counter']
+
+    def close(self):
+        """关闭进程池并释放共享内存（可重复调用）。"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        for shm in self._shm:
+            shm.close()
+            shm.unlink()
+        self._shm = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,145 @@
+import bisect
+from Hypervolume import hypervolume_2d, hv_insert_delta, hv_remove_delta, hv_truncate_2d
+from CrowdingDistance import crowding_distance, crowding_order
+
+class ParetoArchive:
+    """
+    双目标（最大化）增量式 Pareto 存档：
+    - 非支配解按 f1（spread）升序保存，此时 f2（fairness）严格降序，完全相同的解相邻保留；
+    - 插入新解时用 bisect 定位：只需看 f1 不小于它的第一个解即可判断是否被支配，
+      被它支配的旧解是紧挨插入位置左侧的一段连续区间，一次切片删除，O(log n + k)；
+    - 超出 capacity 时按拥挤距离（'crowding'）或超体积贡献（'hv'）裁剪；
+    - 相对 reference_point 的超体积随插入与裁剪增量维护，hypervolume() 直接返回；
+    - ordered() 按 update_elite_archive 列表存档的顺序返回（先插入的在前，拥挤距离裁剪后按距离降序重排），
+      供依赖 “存档第一个解” 的算法沿用原来的取法；
+    - 可迭代、可下标访问，元素为 (solution, fitness)，可直接替换 paretosolution 的列表存档。
+    """
+
+    def __init__(self, capacity=None, truncation='crowding', reference_point=(0, 0)):
+        if truncation not in ('crowding', 'hv'):
+            raise ValueError(f"Unknown truncation strategy: {truncation}")
+        self.capacity = capacity
+        self.truncation = truncation
+        self.reference_point = tuple(reference_point)
+        self._f1 = []       # 升序
+        self._neg_f2 = []   # -f2，升序（即 f2 降序）
+        self._items = []    # (solution, fitness)
+        self._seq = []      # 列表存档中的次序键，见 ordered()
+        self._next_seq = 0
+        self._hv = 0.0      # 相对 reference_point 的超体积
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __repr__(self):
+        return f"ParetoArchive(size={len(self)}, capacity={self.capacity})"
+
+    def fitnesses(self):
+        """按 f1 升序返回所有目标值。"""
+        return [fitness for _, fitness in self._items]
+
+    def ordered(self):
+        """按列表存档的顺序返回 (solution, fitness)：存活解按插入先后，拥挤距离裁剪后按距离降序，之后插入的排在后面。"""
+        return [self._items[i] for i in sorted(range(len(self._items)), key=self._seq.__getitem__)]
+
+    def dominated(self, fitness):
+        """fitness 是否被存档中的某个解严格支配。"""
+        f1, f2 = fitness[0], fitness[1]
+        j = bisect.bisect_left(self._f1, f1)
+        if j == len(self._items):
+            return False
+        # f1 不小于 f1 的解中，第一个的 f2 最大
+        return -self._neg_f2[j] >= f2 and not (self._f1[j] == f1 and -self._neg_f2[j] == f2)
+
+    def add(self, solution, fitness, truncate=True):
+        """
+        插入一个解。
+        :param truncate: 超出容量时是否立即裁剪（批量插入时由 update 统一裁剪）
+        :return: 是否被接受（被支配的解不插入）
+        """
+        fitness = tuple(fitness)
+        f1, f2 = fitness[0], fitness[1]
+        if self.dominated(fitness):
+            return False
+
+        # === 删除被新解支配的旧解：f1 ≤ 新解 且 f2 ≤ 新解 的连续区间 ===
+        hi = bisect.bisect_right(self._f1, f1)
+        lo = bisect.bisect_left(self._neg_f2, -f2, 0, hi)
+        # 完全相同的解保留，插在相同解之后，超体积不变
+        if not (lo < hi and self._point(hi - 1) == (f1, f2)):
+            left = self._point(lo - 1) if lo > 0 else None
+            right = self._point(hi) if hi < len(self._items) else None
+            dominated = [self._point(i) for i in range(lo, hi)]
+            self._hv += hv_insert_delta((f1, f2), left, right, dominated, self.reference_point)
+            del self._f1[lo:hi], self._neg_f2[lo:hi], self._items[lo:hi], self._seq[lo:hi]
+            hi = lo
+
+        self._f1.insert(hi, f1)
+        self._neg_f2.insert(hi, -f2)
+        self._items.insert(hi, (solution, fitness))
+        self._seq.insert(hi, self._next_seq)
+        self._next_seq += 1
+
+        if truncate and self.capacity is not None and len(self._items) > self.capacity:
+            self.truncate()
+        return True
+
+    def update(self, new_solutions):
+        """批量插入 (solution, fitness)，全部插入后再统一裁剪（与 update_elite_archive 一致）。"""
+        for solution, fitness in new_solutions:
+            self.add(solution, fitness, truncate=False)
+        if self.capacity is not None and len(self._items) > self.capacity:
+            self.truncate()
+        return self
+
+    def truncate(self, capacity=None):
+        """裁剪到 capacity 个解。"""
+        capacity = self.capacity if capacity is None else capacity
+        excess = len(self._items) - capacity
+        if excess <= 0:
+            return
+        if self.truncation == 'crowding':
+            # 与 update_elite_archive 相同：在列表存档顺序上一次性保留拥挤距离最大的 capacity 个解
+            # （距离相同时保留靠前的），并按距离降序重排列表存档顺序
+            order = sorted(range(len(self._items)), key=self._seq.__getitem__)
+            ranked = [order[j] for j in crowding_order([self._items[i][1] for i in order])[:capacity].tolist()]
+            for rank, i in enumerate(ranked):
+                self._seq[i] = rank
+            self._next_seq = capacity
+            keep = sorted(ranked)
+        else:
+            # 逐个删除超体积贡献最小的解（堆 + 邻居增量更新）
+            keep = hv_truncate_2d([self._point(i) for i in range(len(self._items))], capacity, self.reference_point)
+
+        # 从左到右逐个删除未保留的解，超体积按删除增量更新：左邻居是此前最后一个保留的解，右邻居是原列表中的下一个解
+        kept = set(keep)
+        left = None
+        for i in range(len(self._items)):
+            if i in kept:
+                left = self._point(i)
+            else:
+                right = self._point(i + 1) if i + 1 < len(self._items) else None
+                self._hv += hv_remove_delta(self._point(i), left, right, self.reference_point)
+        self._f1 = [self._f1[i] for i in keep]
+        self._neg_f2 = [self._neg_f2[i] for i in keep]
+        self._items = [self._items[i] for i in keep]
+        self._seq = [self._seq[i] for i in keep]
+
+    def _point(self, i):
+        return self._f1[i], -self._neg_f2[i]
+
+    def hypervolume(self, reference_point=None):
+        """当前存档的超体积；参考点与构造时相同则直接返回增量维护的值。"""
+        if reference_point is None or tuple(reference_point) == self.reference_point:
+            return self._hv
+        return hypervolume_2d(self.fitnesses(), reference_point)
+
+    def crowding_distances(self):
+        """按存档顺序返回拥挤距离（两端为 inf）。"""
+        return crowding_distance(self.fitnesses()).tolist()
@@ -0,0 +1,95 @@
+import numpy as np
+from GreyWolf import GreyWolf
+
+class WolfView(GreyWolf):
+    """
+    Population 中第 i 个个体的只读视图（轻量 GreyWolf）：
+    - Position：该行节点编号组成的 frozenset
+    - Cost：costs 第 i 行的 Python float 组成的 tuple
+    两者都在首次访问时构造并存入实例字典，之后的读取与普通 GreyWolf 的属性读取一样快。
+    现有按 wolf.Position / wolf.Cost 访问的代码可以直接使用。
+    """
+    __slots__ = ('population', 'index')
+
+    def __init__(self, population, index):
+        self.population = population
+        self.index = index
+
+    def __getattr__(self, name):
+        # 只在实例字典中还没有该属性时调用
+        if name == 'Position':
+            row = self.population.positions[self.index]
+            value = frozenset(row[row >= 0].tolist())
+        elif name == 'Cost':
+            value = tuple(self.population.costs[self.index].tolist())
+        else:
+            raise AttributeError(name)
+        self.__dict__[name] = value
+        return value
+
+    def __repr__(self):
+        return f"WolfView(index={self.index}, Cost={self.Cost})"
+
+class Population:
+    """
+    结构数组（SoA）形式的种群 / 存档：
+    - costs：(N, 2) float64，每行为 (spread, fairness)
+    - positions：(N, width) int32，每行为升序排列的种子节点编号，不足 width 处补 -1
+    非支配排序、拥挤距离、区域划分、超体积等都直接在 costs 上做 NumPy 运算；
+    需要对象接口时通过 pop[i]（WolfView，同一下标总是返回同一个视图对象）访问。
+    要求节点编号为非负整数（与 main.py 中 nodetype=int 读入的图一致）。
+    """
+
+    def __init__(self, positions, costs):
+        self.positions = np.asarray(positions, dtype=np.int32)
+        self.costs = np.asarray(costs, dtype=np.float64).reshape(-1, 2)
+        self._views = [None] * len(self.costs)
+
+    @classmethod
+    def from_wolves(cls, wolves):
+        """由 GreyWolf 列表（或任何带 Position / Cost 的对象）构造，复制其位置与目标值。"""
+        width = max((len(wolf.Position) for wolf in wolves), default=0)
+        positions = np.full((len(wolves), width), -1, dtype=np.int32)
+        for row, wolf in zip(positions, wolves):
+            row[:len(wolf.Position)] = sorted(wolf.Position)
+        costs = np.array([wolf.Cost[:2] for wolf in wolves], dtype=np.float64).reshape(-1, 2)
+        return cls(positions, costs)
+
+    def __len__(self):
+        return len(self.costs)
+
+    def __getitem__(self, index):
+        if self._views[index] is None:
+            self._views[index] = WolfView(self, index % len(self))
+        return self._views[index]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def take(self, indices):
+        """按下标取子种群（复制数组）。"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return Population(self.positions[indices], self.costs[indices])
+
+    def same_as(self, other):
+        """两个种群的位置与目标值是否逐行相同。"""
+        return (other is not None and self.positions.shape == other.positions.shape
+                and np.array_equal(self.positions, other.positions) and np.array_equal(self.costs, other.costs))
+
+    def unique_positions(self, prefer=None):
+        """
+        按位置去重：返回每个不同种子集合保留的下标，顺序为该集合首次出现的顺序。
+        :param prefer: prefer(i, j) 为真时用后出现的 j 替换已保留的 i（默认保留第一次出现的）
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64)
+        _, first, inverse = np.unique(self.positions, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        keep = first.copy()
+        if prefer is not None:
+            counts = np.bincount(inverse, minlength=len(first))
+            for group in np.flatnonzero(counts > 1):
+                for j in np.flatnonzero(inverse == group)[1:]:
+                    if prefer(keep[group], j):
+                        keep[group] = j
+        return keep[np.argsort(first, kind='stable')]
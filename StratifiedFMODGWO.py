@@ -93,10 +93,13 @@ class StratifiedFMODGWO:
 
                 # 设置狼的种子集合为构造好的节点集
             wolf.Position = selected
-            # 评估该种子集合的多目标成本（传播、成本、公平性等）
-            wolf.Cost = self.evaluator.evaluate(wolf.Position)
             # 将该个体添加到种群中
             self.population.append(wolf)
+
+        # 整个种群一次性批量评估多目标成本（传播、公平性等）
+        costs = self.evaluator.evaluate_many([wolf.Position for wolf in self.population])
+        for wolf, cost in zip(self.population, costs):
+            wolf.Cost = tuple(cost)
     def stratified_sample(self, candidate_nodes, degree_dict, sample_size=200):
         """
         对candidate_nodes按degree分层采样。
@@ -153,7 +156,7 @@ class StratifiedFMODGWO:
                 # archive = self.archive_mgr.archive
 
                 # 动态选择当前的leaders
-                alpha, beta, delta = self.leader_mgr.select_leaders_by_region(self.archive_mgr.get_fronts())
+                alpha, beta, delta = self.leader_mgr.select_leaders_by_region(self.archive_mgr.get_fronts_snapshot())
 
                 # 构建三头狼和当前狼的共同节点
                 base = wolf.Position & alpha.Position & beta.Position & delta.Position
@@ -169,12 +172,8 @@ class StratifiedFMODGWO:
                         sample_size = min(200, len(candidate_nodes))
                         sampled_nodes = self.stratified_sample(candidate_nodes, self.StructureMetrics.degree, sample_size)
 
-                        scores = []
-                        for node in sampled_nodes:
-                            score = self.StructureMetrics.score(node, t, max_iter, transition_point)
-                            scores.append((node, score))
-                        scores.sort(key=lambda x: x[1], reverse=True)
-                        candidate_nodes = [node for node, _ in scores]
+                        # 整代共用的评分向量（StructureMetrics.scores_at 按代缓存），一次排序
+                        candidate_nodes = self.StructureMetrics.rank_nodes(sampled_nodes, t, max_iter, transition_point)
                     # # 为所有候选节点打分
                     # scores = []
                     # for node in candidate_nodes:
@@ -204,12 +203,8 @@ class StratifiedFMODGWO:
                         sample_size = min(500, len(candidate_nodes))
                         sampled_nodes = self.stratified_sample(candidate_nodes, self.StructureMetrics.degree, sample_size)
 
-                        scores = []
-                        for node in sampled_nodes:
-                            score = self.StructureMetrics.score(node, t, max_iter, transition_point)
-                            scores.append((node, score))
-                        scores.sort(key=lambda x: x[1], reverse=True)
-                        candidate_nodes = [node for node, _ in scores]
+                        # 整代共用的评分向量（StructureMetrics.scores_at 按代缓存），一次排序
+                        candidate_nodes = self.StructureMetrics.rank_nodes(sampled_nodes, t, max_iter, transition_point)
                     needed = self.budget - len(base)
                     if len(candidate_nodes) <= needed:
                         new_nodes = set(candidate_nodes)
@@ -237,9 +232,13 @@ class StratifiedFMODGWO:
 
                 if random.random() < p_perturb:
                     new_position = self.perturb.perturb(new_position, ratio=perturb_ratio)
-                # 更新狼的位置与适应度
+                # 更新狼的位置（适应度在整代结束后批量评估）
                 wolf.Position = new_position
-                wolf.Cost = self.evaluator.evaluate(new_position)
+
+            # 整代新位置一次性批量评估
+            costs = self.evaluator.evaluate_many([wolf.Position for wolf in self.population])
+            for wolf, cost in zip(self.population, costs):
+                wolf.Cost = tuple(cost)
 
             # 更新存档
             self.archive_mgr.update(self.population)
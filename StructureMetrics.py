@@ -1,17 +1,105 @@
-import networkx as nx
+import numpy as np
+from CSRGraph import CSRGraph
+from Centrality import adjacency, closeness_centrality, approx_closeness_centrality, eigenvector_centrality
 
 class StructureMetrics:
-    def __init__(self, graph):
+    """
+    图结构指标。度、接近中心性、特征向量中心性以按 csr 下标对齐的数组保存
+    （degree_values / closeness_values / eigenvector_values，从 MetricsCache 读取时为内存映射数组），
+    评分等计算直接在数组上进行；degree / closeness / eigenvector 字典只在首次访问时由数组构造。
+    """
+    CLOSENESS_MODES = ('exact', 'approx')
+
+    def __init__(self, graph, closeness='exact', epsilon=0.1, seed=None):
+        """
+        :param closeness: 'exact'：精确接近中心性（CSR 按位并行 BFS，与 nx.closeness_centrality 结果相同）；
+                          'approx'：枢纽抽样近似（Eppstein–Wang），适用于大图
+        :param epsilon: 'approx' 模式的误差参数，枢纽数为 ⌈ln(n) / ε²⌉
+        :param seed: 'approx' 模式抽取枢纽的随机种子
+        """
+        self.params = self.parameters(closeness, epsilon, seed)
         self.graph = graph
+        self.csr = CSRGraph(graph)
+        A = adjacency(self.csr)  # scipy.sparse 邻接矩阵，特征向量中心性等共用
 
         # === 中心性指标 ===
-        self.degree = dict(graph.degree())                           # 度中心性
-        self.closeness = nx.closeness_centrality(graph)             # 接近中心性（路径平均距离倒数）
-        self.eigenvector = nx.eigenvector_centrality(graph, max_iter=500)  # ✅ 替代 betweenness，用于 hub
+        degree = dict(graph.degree())
+        self.degree_values = np.array([degree[v] for v in self.csr.nodes], dtype=np.int64)  # 度中心性
+        if closeness == 'exact':
+            self.closeness_values = closeness_centrality(self.csr)  # 接近中心性（路径平均距离倒数）
+        else:
+            self.closeness_values = approx_closeness_centrality(self.csr, epsilon=epsilon, seed=seed)
+        # ✅ 替代 betweenness，用于 hub（稀疏矩阵幂迭代，与 nx.eigenvector_centrality 一致）
+        self.eigenvector_values = eigenvector_centrality(self.csr, max_iter=500, A=A)
+        self._reset_cache()
 
         # 如果需要切换为 harmonic：
         # self.closeness = nx.harmonic_centrality(graph)
 
+    @classmethod
+    def parameters(cls, closeness='exact', epsilon=0.1, seed=None):
+        """决定计算结果的参数（MetricsCache 的缓存键）；精确模式下 epsilon / seed 不影响结果。"""
+        if closeness not in cls.CLOSENESS_MODES:
+            raise ValueError(f"Unknown closeness mode: {closeness}")
+        if closeness == 'exact':
+            epsilon = seed = None
+        return {'closeness': closeness, 'epsilon': epsilon, 'seed': seed}
+
+    def to_arrays(self):
+        """导出为按 csr 下标对齐的数组（含 CSR 本身），供 MetricsCache 保存。"""
+        return {
+            'nodes': np.asarray(self.csr.nodes),
+            'indptr': self.csr.indptr,
+            'indices': self.csr.indices,
+            'degree': self.degree_values,
+            'closeness': self.closeness_values,
+            'eigenvector': self.eigenvector_values,
+        }
+
+    @classmethod
+    def from_arrays(cls, graph, arrays, params):
+        """
+        由 to_arrays() 的结果恢复，不重新计算任何指标。
+        数组原样保存（内存映射时按需分页读取），不转为 Python 列表或字典。
+        arrays['nodes'] 须与 graph.nodes() 的顺序相同（由 MetricsCache 检查），节点列表直接取自 graph。
+        """
+        metrics = cls.__new__(cls)
+        metrics.params = dict(params)
+        metrics.graph = graph
+        metrics.csr = CSRGraph.from_arrays(arrays['indptr'], arrays['indices'], list(graph.nodes()))
+        metrics.degree_values = arrays['degree']
+        metrics.closeness_values = arrays['closeness']
+        metrics.eigenvector_values = arrays['eigenvector']
+        metrics._reset_cache()
+        return metrics
+
+    def _as_dict(self, name):
+        """{节点: 指标值}，首次访问时由对应的数组构造并缓存。"""
+        if name not in self._dicts:
+            self._dicts[name] = dict(zip(self.csr.nodes, getattr(self, f"{name}_values").tolist()))
+        return self._dicts[name]
+
+    @property
+    def degree(self):
+        return self._as_dict('degree')
+
+    @property
+    def closeness(self):
+        return self._as_dict('closeness')
+
+    @property
+    def eigenvector(self):
+        return self._as_dict('eigenvector')
+
+    def top_nodes(self, name, k):
+        """按指标从高到低的前 k 个节点（值相同保持图中的节点顺序），与 sorted(dict, key=dict.get, reverse=True)[:k] 相同。"""
+        order = np.argsort(-np.asarray(getattr(self, f"{name}_values")), kind='stable')[:k]
+        return [self.csr.nodes[i] for i in order.tolist()]
+
+    def _reset_cache(self):
+        self._dicts = {}            # 按需构造的 {节点: 指标值} 字典
+        self._score_tables = None   # (global, local) float32 评分表
+
     def _normalize(self, values):
         """
         将中心性字典归一化至 [0, 1] 区间，避免数值尺度影响。
@@ -22,22 +110,58 @@ class StructureMetrics:
             for k, v in values.items()
         }
 
+    def _score_arrays(self):
+        """按 csr 下标对齐的 global / local 评分（float64，运算与 _normalize 后逐节点计算相同）。"""
+        deg = np.asarray(self.degree_values, dtype=np.float64)
+        clo = np.asarray(self.closeness_values, dtype=np.float64)
+        deg_norm = (deg - deg.min()) / (deg.max() - deg.min() + 1e-9)
+        clo_norm = (clo - clo.min()) / (clo.max() - clo.min() + 1e-9)
+
+        # Global 偏探索：高 degree + 小 closeness（越远越好）
+        score_global = 0.8 * deg_norm + 0.2 * (1 - clo_norm)
+        # Local 偏开发：高 degree + 高 closeness（越中心越好）
+        score_local = 0.5 * deg_norm + 0.5 * clo_norm
+        return score_global, score_local
+
     def compute_scores(self):
         """
         结构评分函数（一次性输出两类评分）：
         - global：探索性评分，倾向于选 degree 高且离中心远的节点（低 closeness）；
         - local：开发性评分，倾向于选 degree 高且结构中心节点（高 closeness）。
         """
-        deg_norm = self._normalize(self.degree)
-        clo_norm = self._normalize(self.closeness)
+        score_global, score_local = self._score_arrays()
+        nodes = self.csr.nodes
+        return dict(zip(nodes, score_global.tolist())), dict(zip(nodes, score_local.tolist()))
 
-        score_global = {}
-        score_local = {}
+    def score_tables(self):
+        """(global, local) 评分表：只读 float32 数组，按 csr 下标对齐，首次调用时计算。"""
+        if self._score_tables is None:
+            self._score_tables = tuple(scores.astype(np.float32) for scores in self._score_arrays())
+            for table in self._score_tables:
+                table.flags.writeable = False
+        return self._score_tables
 
-        for node in self.graph.nodes():
-            # Global 偏探索：高 degree + 小 closeness（越远越好）
-            score_global[node] = 0.8 * deg_norm[node] + 0.2 * (1 - clo_norm[node])
-            # Local 偏开发：高 degree + 高 closeness（越中心越好）
-            score_local[node] = 0.5 * deg_norm[node] + 0.5 * clo_norm[node]
+    def scores_at(self, t, max_iter, transition_point=0.6):
+        """
+        第 t 代全部节点的结构评分（float32，按 csr 下标对齐）：
+        与优化器的阶段划分一致，t < transition_point * max_iter 的全局探索阶段为 global 评分，之后为 local 评分。
+        返回缓存的只读评分表本身，同一阶段内的各代共用，不重新计算。
+        """
+        score_global, score_local = self.score_tables()
+        return score_global if t < transition_point * max_iter else score_local
 
-        return score_global, score_local
+    def score(self, node, t, max_iter, transition_point=0.6):
+        """单个节点第 t 代的结构评分：按阶段取 compute_scores 中该节点的 global / local 评分（float32 精度，与 scores_at 一致）。"""
+        if 'scores' not in self._dicts:
+            self._dicts['scores'] = self.compute_scores()
+        score_global, score_local = self._dicts['scores']
+        table = score_global if t < transition_point * max_iter else score_local
+        return float(np.float32(table[node]))
+
+    def rank_nodes(self, nodes, t, max_iter, transition_point=0.6):
+        """按第 t 代评分从高到低排列 nodes（评分相同保持原顺序），等价于逐个 score() 后稳定排序。"""
+        nodes = list(nodes)
+        if not nodes:
+            return nodes
+        scores = self.scores_at(t, max_iter, transition_point)[self.csr.to_indices(nodes)]
+        return [nodes[i] for i in np.argsort(-scores, kind='stable')]
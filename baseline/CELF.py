@@ -3,10 +3,17 @@ import time
 from copy import deepcopy
 from Evaluator import *
 
-def CELF_seed_selection(graph, budget, node_to_comm, total_communities):
+def CELF_seed_selection(graph, budget, node_to_comm, total_communities, backend='live_edge', evaluator=None):
+    """
+    :param backend: 新建评估器的模拟后端；'live_edge' 下候选节点的边际增益只增量统计其可达集
+    :param evaluator: 直接传入的评估器（忽略 backend）
+    选出的种子集合最后用默认（csr 蒙特卡洛）评估器重新评估一次：
+    在选种所用的同一组 live-edge 世界上报告的 spread 偏乐观，与多目标算法的评估方式也不一致。
+    """
     start_time = time.time()
     all_solutions = []
-    evaluator = Evaluator(graph, node_to_comm, total_communities)
+    if evaluator is None:
+        evaluator = Evaluator(graph, node_to_comm, total_communities, backend=backend)
 
     # 1. 计算每个节点的边际增益 (单独作为种子)
     marg_gain = []
@@ -22,7 +29,7 @@ def CELF_seed_selection(graph, budget, node_to_comm, total_communities):
     S = {Q[0][0]}
     spread = Q[0][1]
     Q = Q[1:]
-    final_cost = evaluator.evaluate(list(S))  # ✅ 初始化，防止 budget=1 出错
+    state = evaluator.evaluate_state(list(S))  # ✅ 保留父状态，候选集合只增量评估新增节点
     elapsed = time.time() - start_time  # ✅ 初始时间
 
     # 3. 迭代选择剩余 budget-1 个节点
@@ -30,8 +37,7 @@ def CELF_seed_selection(graph, budget, node_to_comm, total_communities):
         check = False
         while not check:
             current = Q[0][0]
-            candidate_set = S | {current}
-            cost = evaluator.evaluate(list(candidate_set))
+            cost = evaluator.delta_cost(state, add=[current])  # 只取目标值，不复制父状态
             new_spread = cost[0] - spread
 
             Q[0] = (current, new_spread)
@@ -41,10 +47,12 @@ def CELF_seed_selection(graph, budget, node_to_comm, total_communities):
         # 更新 S 与 spread
         spread += Q[0][1]
         S.add(Q[0][0])
+        state = evaluator.evaluate_delta(state, add=[Q[0][0]])
         Q = Q[1:]
-        final_cost = evaluator.evaluate(list(S))
         elapsed = time.time() - start_time
 
+    # 选种之外的独立评估（与多目标算法相同的默认评估器）
+    final_cost = Evaluator(graph, node_to_comm, total_communities).evaluate(list(S))
     all_solutions.append((deepcopy(S), deepcopy(final_cost), deepcopy(elapsed)))
     return all_solutions
 
@@ -2,28 +2,35 @@ import networkx as nx
 import time
 from copy import deepcopy
 from Evaluator import *
+from Centrality import betweenness_centrality
 
-def betweenness_seed_selection(graph, budget, node_to_comm, total_communities):
+def betweenness_seed_selection(graph, budget, node_to_comm, total_communities, k=None, workers=1, seed=None):
     """
     基于 Betweenness Centrality 的种子节点选择算法。
+    :param k: 抽样源节点数（None 为精确计算）
+    :param workers: >1 时按源节点分块多进程并行计算
+    :param seed: 抽样源节点的随机种子
+    :return: [(seed_set, fitness, 算法运行时间, 评估时间)]
     """
     start_time = time.time()
     all_solutions = []
 
     # 1. 计算 Betweenness Centrality
-    betweenness_centrality = nx.betweenness_centrality(graph)
+    betweenness = dict(zip(graph.nodes(), betweenness_centrality(graph, k=k, workers=workers, seed=seed).tolist()))
 
     # 2. 排序并选出前 budget 个节点
-    sorted_nodes = sorted(betweenness_centrality.items(), key=lambda x: x[1], reverse=True)
+    sorted_nodes = sorted(betweenness.items(), key=lambda x: x[1], reverse=True)
     seed_set = {node for node, _ in sorted_nodes[:budget]}
 
-    # 3. 调用新的 Evaluator 评估
+    # 3. 记录运行时间（仅选种算法，不含评估）
+    elapsed_time = time.time() - start_time
+
+    # 4. 调用新的 Evaluator 评估
+    eval_start = time.time()
     evaluator = Evaluator(graph, node_to_comm, total_communities)
     fitness_values = evaluator.evaluate(seed_set)
-
-    # 4. 记录运行时间
-    elapsed_time = time.time() - start_time
+    eval_time = time.time() - eval_start
 
     # 5. 存储结果
-    all_solutions.append((deepcopy(seed_set), deepcopy(fitness_values), deepcopy(elapsed_time)))
+    all_solutions.append((deepcopy(seed_set), deepcopy(fitness_values), deepcopy(elapsed_time), deepcopy(eval_time)))
     return all_solutions
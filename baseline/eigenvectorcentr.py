@@ -2,6 +2,8 @@ import time
 import networkx as nx
 from copy import deepcopy
 from Evaluator import *
+from CSRGraph import CSRGraph
+from Centrality import eigenvector_centrality
 
 def eigenvector_seed_selection(graph, budget, node_to_comm, total_communities):
     """
@@ -10,11 +12,12 @@ def eigenvector_seed_selection(graph, budget, node_to_comm, total_communities):
     start_time = time.time()
     all_solutions = []
 
-    # 1. 计算 Eigenvector Centrality
-    eigenvector_centrality = nx.eigenvector_centrality(graph, max_iter=1000)
+    # 1. 计算 Eigenvector Centrality（稀疏矩阵幂迭代，与 nx.eigenvector_centrality 一致）
+    csr = CSRGraph(graph)
+    eigenvector = dict(zip(csr.nodes, eigenvector_centrality(csr, max_iter=1000).tolist()))
 
     # 2. 排序后取前 budget 个节点
-    sorted_nodes = sorted(eigenvector_centrality.items(), key=lambda x: x[1], reverse=True)
+    sorted_nodes = sorted(eigenvector.items(), key=lambda x: x[1], reverse=True)
     seed_set = {node for node, _ in sorted_nodes[:budget]}
 
     # 3. 调用 Evaluator 进行评估
@@ -3,13 +3,16 @@ import time
 import networkx as nx
 from Evaluator import *
 from copy import deepcopy
+from CSRGraph import CSRGraph
+from Centrality import pagerank
 
 def pagerank_seed_selection(graph, budget, node_to_comm, total_communities):
     start_time = time.time()
     all_solutions = []
 
-    # Step 1: Compute PageRank
-    pagerank_dict = nx.pagerank(graph)
+    # Step 1: Compute PageRank (sparse mat-vec iteration, same result as nx.pagerank)
+    csr = CSRGraph(graph)
+    pagerank_dict = dict(zip(csr.nodes, pagerank(csr).tolist()))
 
     # Step 2: Sort and select top-k nodes
     sorted_nodes = sorted(pagerank_dict.items(), key=lambda x: x[1], reverse=True)
@@ -1,10 +1,13 @@
 import random
+import numpy as np
+from collections import deque
 from GreyWolf import GreyWolf
 from ArchiveManager import *
 from Evaluator import *
 from PerturbationHandler import *
 from LeaderManager import *
 from StructureMetrics import *
+from Checkpoint import CheckpointWriter, load_checkpoint
 import time
 
 class communityStratifiedFMODGWO:
@@ -12,7 +15,8 @@ class communityStratifiedFMODGWO:
     社区感知多目标灰狼优化算法：集成社区结构、静态中心性评分、动态扰动机制（含反馈调节）以解决多目标图优化问题。
     """
 
-    def __init__(self, graph, structure_metrics, budget, pop_size, archive_size, node_to_comm, total_communities):
+    def __init__(self, graph, structure_metrics, budget, pop_size, archive_size, node_to_comm, total_communities,
+                 evaluator=None, archive_truncation='crowding'):
         self.graph = graph
         self.StructureMetrics = structure_metrics
         self.budget = budget
@@ -22,11 +26,11 @@ class communityStratifiedFMODGWO:
         self.node_to_comm = node_to_comm
         self.total_communities = total_communities
 
-        # 初始化功能模块
-        self.evaluator = Evaluator(graph, node_to_comm, total_communities)
+        # 初始化功能模块（可外部注入评估器，如 ParallelEvaluator）
+        self.evaluator = evaluator if evaluator is not None else Evaluator(graph, node_to_comm, total_communities)
         self.perturb = PerturbationHandler(self.StructureMetrics)
-        self.archive_mgr = ArchiveManager(self.archive_size)
-        self.leader_mgr = LeaderManager(self.archive_mgr.calculate_crowding_distance)
+        self.archive_mgr = ArchiveManager(self.archive_size, truncation=archive_truncation)
+        self.leader_mgr = LeaderManager()
 
         # self.leader_mgr = LeaderManager()
         self.population = []
@@ -100,24 +104,64 @@ class communityStratifiedFMODGWO:
                     if replaced:
                         break  # 替换完成，退出循环
 
-            # === Step 3: 完成初始化个体评估 ===
+            # === Step 3: 记录个体位置（评估在种群构建完成后批量进行） ===
             wolf.Position = selected
-            wolf.Cost = self.evaluator.evaluate(wolf.Position)
             self.population.append(wolf)
 
             # ✅ 可选调试输出（可注释）
             covered_now = set(self.node_to_comm[n] for n in selected)
             print(f"Wolf {i+1}: covers {len(covered_now)} communities.")
 
-    def optimize(self, max_iter):
-        self.initialize_population()
-        self.archive_mgr.update(self.population)
+        # === Step 4: 整个种群一次性批量评估 ===
+        costs = self.evaluator.evaluate_many([wolf.Position for wolf in self.population])
+        for wolf, cost in zip(self.population, costs):
+            wolf.Cost = tuple(cost)
 
+    def _config(self, max_iter):
+        """决定搜索轨迹的参数，续跑时必须与检查点一致。"""
+        return {'budget': self.budget, 'pop_size': self.pop_size, 'archive_size': self.archive_size,
+                'max_iter': max_iter, 'archive_truncation': self.archive_mgr.truncation}
+
+    def optimize(self, max_iter, checkpoint_path=None, checkpoint_every=1, resume=None, history=None):
+        """
+        :param checkpoint_path: 检查点文件路径；给出时每 checkpoint_every 代（以及最后一代）
+                                在后台线程写出完整状态（种群、存档、停滞计数、随机数状态、历史记录）
+        :param resume: 检查点文件路径；给出时从该检查点的下一代继续，结果与不中断运行一致
+                       （评估器需按原方式构造，见 Evaluator.get_state）。最后一代的检查点标记为已完成，
+                       不能再续跑（见 Checkpoint.is_resumable）
+        :param history: HistorySink；给出时每代记录追加写入磁盘，
+                        返回的 archive_costs_history 只保留最近 history.window.maxlen 代
+        """
         archive_costs_history = []
         hv_values = []
         times = []
         transition_point = 0.6  # 60% 前为 global，后为 local
         stagnation_counter = 0
+        start_iter = 0
+        state = None
+
+        if resume is not None:
+            state = load_checkpoint(resume)
+            if state.get('complete', False):
+                raise ValueError(f"Checkpoint {resume} belongs to a finished run")
+            if state['config'] != self._config(max_iter):
+                raise ValueError(f"Checkpoint config {state['config']} does not match {self._config(max_iter)}")
+            self.population = state['population']
+            self.archive_mgr = state['archive_mgr']
+            archive_costs_history = state['archive_costs_history']
+            hv_values = state['hv_values']
+            times = state['times']
+            stagnation_counter = state['stagnation_counter']
+            start_iter = state['t'] + 1
+            self.evaluator.set_state(state['evaluator'])
+        else:
+            self.initialize_population()
+            self.archive_mgr.update(self.population)
+
+        if history is not None:
+            # 丢弃检查点之后（或上一次运行）写入的记录，保证磁盘上的历史与本次运行一致
+            history.rewind(start_iter)
+            archive_costs_history = deque(archive_costs_history, maxlen=history.window.maxlen)
         stagnation_threshold = 10 #monitor the variant of HV value
         hv_tolerance = 1e-6
 
@@ -143,118 +187,158 @@ class communityStratifiedFMODGWO:
 
         # === Hub 节点提取 ===
         # 在主算法初始化阶段使用 eigenvector 提取 hub 节点
-        hub_score = self.StructureMetrics.eigenvector
-        hub_nodes = sorted(hub_score, key=hub_score.get, reverse=True)[:int(0.05 * len(hub_score))]
+        # 直接在 eigenvector 数组上排序（从缓存读取时不必先构造字典）
+        hub_nodes = self.StructureMetrics.top_nodes('eigenvector', int(0.05 * self.StructureMetrics.csr.num_nodes))
         self.hub_nodes = hub_nodes
 
-        for t in range(max_iter):
-            start_time = time.time()
-            # # === Step 0: 精英参与更新（加入种群一起演化）===
-            # elite_ratio = 0.1  # 保留比例（10%）
-            # elite_num = max(1, int(elite_ratio * self.pop_size))
-            # elite_pool = self.archive_mgr.archive
-            # elites = []
-            #
-            # if elite_pool:
-            #     # 选出 top-k 精英个体并深拷贝
-            #     elites = sorted(elite_pool, key=lambda w: -(w.Cost[0] + w.Cost[1]))[:elite_num]
-            #     self.population.extend(copy.deepcopy(elites))  # 与原始种群合并
-
-            self.leader_mgr.ensure_leader_minimum(self.archive_mgr.archive, self.population)
-            search_tendency = "global" if t < transition_point * max_iter else "local"
-
-            for wolf in self.population:
-                alpha, beta, delta, explorer = self.leader_mgr.select_leaders_with_tradeoff_explorer(
-                    self.archive_mgr.get_fronts())
-
-                # alpha, beta, delta = self.leader_mgr.select_leaders_by_region(self.archive_mgr.get_fronts())
-                # ✅ 使用并集代替三头交集，提升多样性、增强探索能力
-                # base = wolf.Position & (alpha.Position | beta.Position | delta.Position)
-                leader_union = alpha.Position | beta.Position | delta.Position | explorer.Position
-                base = wolf.Position & leader_union
-
-                # 控制 base 不超过预算的一定比例（后期 base 越大）
-                max_base_len = int(self.budget * (0.3 + 0.4 * (t / max_iter)))
-                if len(base) > max_base_len:
-                    base = set(random.sample(base, max_base_len))
-                needed = self.budget - len(base)
-
-                candidate_nodes = set()
-                if search_tendency == "global":
-                    for comm_id, candidates in community_samples_global.items():
-                        #(每个社区抽样 20% 的 top 节点),样本来源基于 global score，偏好外围连接节点
-                        candidate_nodes.update(random.sample(candidates, max(1, int(len(candidates) * 0.2))))
-                else:
-                    # --- 1. leader 所在社区 ---
-                    leader_nodes = alpha.Position | beta.Position | delta.Position
-                    leader_comms = set(self.node_to_comm[n] for n in leader_nodes if n in self.node_to_comm)
+        # 随机数状态最后恢复：以上准备工作不消耗随机数
+        if state is not None:
+            random.setstate(state['random_state'])
+            np.random.set_state(state['numpy_state'])
+        writer = CheckpointWriter(checkpoint_path) if checkpoint_path is not None else None
+
+        try:
+            for t in range(start_iter, max_iter):
+                start_time = time.time()
+                # # === Step 0: 精英参与更新（加入种群一起演化）===
+                # elite_ratio = 0.1  # 保留比例（10%）
+                # elite_num = max(1, int(elite_ratio * self.pop_size))
+                # elite_pool = self.archive_mgr.archive
+                # elites = []
+                #
+                # if elite_pool:
+                #     # 选出 top-k 精英个体并深拷贝
+                #     elites = sorted(elite_pool, key=lambda w: -(w.Cost[0] + w.Cost[1]))[:elite_num]
+                #     self.population.extend(copy.deepcopy(elites))  # 与原始种群合并
+
+                self.leader_mgr.ensure_leader_minimum(self.archive_mgr.archive, self.population)
+                search_tendency = "global" if t < transition_point * max_iter else "local"
+                # 本代 fronts 的只读快照（存档成员是独立副本，不受本代位置更新影响），
+                # 区域划分与 leader 排序每代只算一次，每只狼只抽取探索 leader
+                leader_context = self.leader_mgr.prepare(self.archive_mgr.get_fronts_snapshot(),
+                                                         self.archive_mgr.get_front_costs())
+
+                for wolf in self.population:
+                    alpha, beta, delta, explorer = leader_context.draw()
+
+                    # alpha, beta, delta = self.leader_mgr.select_leaders_by_region(self.archive_mgr.get_fronts())
+                    # ✅ 使用并集代替三头交集，提升多样性、增强探索能力
+                    # base = wolf.Position & (alpha.Position | beta.Position | delta.Position)
+                    leader_union = alpha.Position | beta.Position | delta.Position | explorer.Position
+                    base = wolf.Position & leader_union
+
+                    # 控制 base 不超过预算的一定比例（后期 base 越大）
+                    max_base_len = int(self.budget * (0.3 + 0.4 * (t / max_iter)))
+                    if len(base) > max_base_len:
+                        base = set(random.sample(base, max_base_len))
+                    needed = self.budget - len(base)
 
                     candidate_nodes = set()
-                    for comm in leader_comms:
-                        candidate_nodes.update(community_samples_local.get(comm, []))
-
-                    # --- 2. 其他社区比例采样 ---
-                    extra_comms = list(set(community_samples_local.keys()) - leader_comms)
-
-                    # 动态计算其他社区数量
-                    extra_comm_ratio = 0.3
-                    num_extra_comm = max(1, int(extra_comm_ratio * needed))
-                    num_extra_comm = min(num_extra_comm, len(extra_comms))  # 不超过可选数量
-
-                    random.shuffle(extra_comms)
-                    for comm in extra_comms[:num_extra_comm]:
-                        extra_candidates = community_samples_local.get(comm, [])
-                        if extra_candidates:
-                            candidate_nodes.update(random.sample(extra_candidates, 1))
-
-                    # --- 3. 加入 hub 节点比例 ---
-                    hub_ratio = 0.3
-                    num_hubs = max(1, int(hub_ratio * needed))
-                    num_hubs = min(num_hubs, len(self.hub_nodes))
-
-                    candidate_nodes.update(random.sample(self.hub_nodes, num_hubs))
-
-                #从候选中选择补全节点: 排除 base 和原始 Position；随机选取若干个，填满预算；
-                candidate_nodes = list(candidate_nodes - base - wolf.Position)
-                random.shuffle(candidate_nodes)
-                new_nodes = set(candidate_nodes[:needed])
-                new_position = base | new_nodes
-
-                # === [构造新解后] 统一进行扰动判断和扰动操作 ===
-                # - Global：偏探索性扰动（只加 random 节点）
-                # - Local：偏跳跃性扰动（加 hub + random 节点）
-                # - 调用 apply_perturbation 自动判断策略类型
-
-                if random.random() < self.perturb.dynamic_perturbation_prob(t, max_iter, transition_point,stagnation_counter):
-                    new_position = self.perturb.apply_perturbation(
-                        position=new_position,
-                        base=base,
-                        t=t,
-                        max_iter=max_iter,
-                        transition_point=transition_point,
-                        graph=self.graph,
-                        search_tendency=search_tendency,
-                        stagnation_counter=stagnation_counter,
-                        hub_nodes=self.hub_nodes
-                    )
-
-                wolf.Position = new_position
-                wolf.Cost = self.evaluator.evaluate(new_position)
-
-            # === 更新存档与记录 ===
-            self.archive_mgr.update(self.population)
-            archive = self.archive_mgr.archive
-            archive_costs_history.append([sol.Cost for sol in archive])
-            hv = self.archive_mgr.calculate_hypervolume(reference_point=(0, 0))
-            hv_values.append(hv)
-
-            # === 停滞检测 ===
-            if t > 1 and abs(hv_values[-1] - hv_values[-2]) < hv_tolerance:
-                stagnation_counter += 1
-            else:
-                stagnation_counter = 0
-
-            times.append(time.time() - start_time)
-
+                    if search_tendency == "global":
+                        for comm_id, candidates in community_samples_global.items():
+                            #(每个社区抽样 20% 的 top 节点),样本来源基于 global score，偏好外围连接节点
+                            candidate_nodes.update(random.sample(candidates, max(1, int(len(candidates) * 0.2))))
+                    else:
+                        # --- 1. leader 所在社区 ---
+                        leader_nodes = alpha.Position | beta.Position | delta.Position
+                        leader_comms = set(self.node_to_comm[n] for n in leader_nodes if n in self.node_to_comm)
+
+                        candidate_nodes = set()
+                        for comm in leader_comms:
+                            candidate_nodes.update(community_samples_local.get(comm, []))
+
+                        # --- 2. 其他社区比例采样 ---
+                        extra_comms = list(set(community_samples_local.keys()) - leader_comms)
+
+                        # 动态计算其他社区数量
+                        extra_comm_ratio = 0.3
+                        num_extra_comm = max(1, int(extra_comm_ratio * needed))
+                        num_extra_comm = min(num_extra_comm, len(extra_comms))  # 不超过可选数量
+
+                        random.shuffle(extra_comms)
+                        for comm in extra_comms[:num_extra_comm]:
+                            extra_candidates = community_samples_local.get(comm, [])
+                            if extra_candidates:
+                                candidate_nodes.update(random.sample(extra_candidates, 1))
+
+                        # --- 3. 加入 hub 节点比例 ---
+                        hub_ratio = 0.3
+                        num_hubs = max(1, int(hub_ratio * needed))
+                        num_hubs = min(num_hubs, len(self.hub_nodes))
+
+                        candidate_nodes.update(random.sample(self.hub_nodes, num_hubs))
+
+                    #从候选中选择补全节点: 排除 base 和原始 Position；随机选取若干个，填满预算；
+                    candidate_nodes = list(candidate_nodes - base - wolf.Position)
+                    random.shuffle(candidate_nodes)
+                    new_nodes = set(candidate_nodes[:needed])
+                    new_position = base | new_nodes
+
+                    # === [构造新解后] 统一进行扰动判断和扰动操作 ===
+                    # - Global：偏探索性扰动（只加 random 节点）
+                    # - Local：偏跳跃性扰动（加 hub + random 节点）
+                    # - 调用 apply_perturbation 自动判断策略类型
+
+                    if random.random() < self.perturb.dynamic_perturbation_prob(t, max_iter, transition_point,stagnation_counter):
+                        new_position = self.perturb.apply_perturbation(
+                            position=new_position,
+                            base=base,
+                            t=t,
+                            max_iter=max_iter,
+                            transition_point=transition_point,
+                            graph=self.graph,
+                            search_tendency=search_tendency,
+                            stagnation_counter=stagnation_counter,
+                            hub_nodes=self.hub_nodes
+                        )
+
+                    wolf.Position = new_position
+
+                # === 整代新位置一次性批量评估 ===
+                costs = self.evaluator.evaluate_many([wolf.Position for wolf in self.population])
+                for wolf, cost in zip(self.population, costs):
+                    wolf.Cost = tuple(cost)
+
+                # === 更新存档与记录 ===
+                self.archive_mgr.update(self.population)
+                archive = self.archive_mgr.archive
+                archive_costs_history.append([sol.Cost for sol in archive])
+                hv = self.archive_mgr.calculate_hypervolume(reference_point=(0, 0))
+                hv_values.append(hv)
+
+                # === 停滞检测 ===
+                if t > 1 and abs(hv_values[-1] - hv_values[-2]) < hv_tolerance:
+                    stagnation_counter += 1
+                else:
+                    stagnation_counter = 0
+
+                times.append(time.time() - start_time)
+                if history is not None:
+                    history.append(t, archive_costs_history[-1], hv, times[-1])
+
+                if writer is not None and ((t + 1) % checkpoint_every == 0 or t == max_iter - 1):
+                    if history is not None:
+                        history.flush()  # 检查点之前的历史必须已落盘
+                    writer.save({
+                        'config': self._config(max_iter),
+                        't': t,
+                        'complete': t == max_iter - 1,
+                        'population': self.population,
+                        'archive_mgr': self.archive_mgr,
+                        'archive_costs_history': archive_costs_history,
+                        'hv_values': hv_values,
+                        'times': times,
+                        'stagnation_counter': stagnation_counter,
+                        'random_state': random.getstate(),
+                        'numpy_state': np.random.get_state(),
+                        'evaluator': self.evaluator.get_state(),
+                    })
+        finally:
+            # 异常或中断（含 KeyboardInterrupt）时同样关闭评估器（进程池 / 共享内存），并等待已排队的检查点写完
+            self.evaluator.close()
+            if writer is not None:
+                writer.close()
+            if history is not None:
+                history.flush()
         print("time=", times)
-        return self.archive_mgr.archive, archive_costs_history, hv_values, times
\ No newline at end of file
+        return self.archive_mgr.archive, list(archive_costs_history), hv_values, times
\ No newline at end of file
@@ -7,7 +7,8 @@ def save_single_objective_results_to_excel(results_dict, save_dir, network_name,
     Save the seed set, fitness values, and time of single-objective algorithms to an Excel file.
 
     :param results_dict: Dictionary mapping algorithm names to list of run results.
-                         Each run result is a list of tuples: (seed_set, (f1, f2), time)
+                         Each run result is a list of tuples: (seed_set, (f1, f2), time) or
+                         (seed_set, (f1, f2), time, eval_time) when the algorithm time excludes evaluation
     :param save_dir: Directory to save the Excel file.
     :param network_name: Network name to use in the filename.
     :param filename_prefix: Filename prefix (without extension).
@@ -15,13 +16,15 @@ def save_single_objective_results_to_excel(results_dict, save_dir, network_name,
     rows = []
     for algo_name, runs in results_dict.items():
         for run in runs:
-            for seed_set, fitness, elapsed_time in run:
+            for solution in run:
+                seed_set, fitness, elapsed_time = solution[:3]
                 rows.append({
                     'Algorithm': algo_name,
                     'SeedSet': sorted(seed_set),  # convert to sorted list for readability
                     'Fitness1': fitness[0],
                     'Fitness2': fitness[1],
-                    'Time': elapsed_time
+                    'Time': elapsed_time,
+                    'EvalTime': solution[3] if len(solution) > 3 else None
                 })
 
     df = pd.DataFrame(rows)
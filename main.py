@@ -6,6 +6,10 @@ import networkx as nx
 from communityStratifiedFMODGWO import *
 from MObaseline.MODBA import MODBA
 from MObaseline.MODPSO import MODPSO
+from ParallelEvaluator import ParallelEvaluator
+from HistorySink import HistorySink
+from Checkpoint import is_resumable
+from MetricsCache import load_structure_metrics
 # from MObaseline.GFMOGWOpackage import GFMOGWO
 from baseline import degree, CELF, ClosenessCentr, eigenvectorcentr, pagerank, RANDOM, betweennesscentr
 from visualizer import *
@@ -38,9 +42,18 @@ def main():
     archive_size = 100
     max_iter = 100
     runs = 2
+    eval_workers = 1  # >1 时多目标算法使用多进程并行评估（ParallelEvaluator）
+    checkpoint_every = 5  # communityStratifiedFMODGWO 每隔多少代写一次检查点
+    resume_runs = False  # True 时从 checkpoint_dir 中未完成的检查点续跑被中断的 run（已完成的 run 总是重新计算）
+    closeness_mode = 'exact'  # 'approx'：大图上用枢纽抽样近似接近中心性（见 StructureMetrics）
+    centrality_workers = 1  # >1 时介数 / 接近中心性基线按源节点分块多进程并行
+    centrality_pivots = None  # 给出整数 k 时介数 / 接近中心性基线改用 k 个抽样源节点的近似
+    history_window = 10  # 每代存档历史写入磁盘（HistorySink），内存中只保留最近的代数
+    celf_backend = 'live_edge'  # CELF 的模拟后端：live_edge 下候选节点的边际增益按可达集增量计算
 
     # === Step 3: Precompute Structural Metrics ===
-    metrics = StructureMetrics(graph)
+    # 按边文件内容缓存在数据集目录的 metrics_cache 下，边文件不变时直接读取
+    metrics = load_structure_metrics(graph, edges_file, closeness=closeness_mode)
 
     # === Step 4: community detection ===
     edge_dir = os.path.dirname(edges_file)
@@ -62,11 +75,20 @@ def main():
     total_communities = len(communities)
     print(f"✅ Loaded {total_communities} communities from saved file.")
 
+    def make_evaluator():
+        # 每个优化器在 optimize() 结束时关闭自己的评估器，因此每次都新建
+        if eval_workers > 1:
+            return ParallelEvaluator(graph, node_to_comm, total_communities, workers=eval_workers)
+        return None
+
     # === Step 5: Create Directory for Results ===
     save_dir_multi = 'results/MultiObjBaselines'
     save_dir_single = 'results/SingleObjBaselines'
     os.makedirs(save_dir_multi, exist_ok=True)
     os.makedirs(save_dir_single, exist_ok=True)
+    # 检查点按数据集存放；resume_runs 为 True 时从未完成的检查点处继续
+    checkpoint_dir = os.path.join('results', 'checkpoints', os.path.basename(edge_dir))
+    history_dir = os.path.join('results', 'history', os.path.basename(edge_dir))
 
     # === Step 6: Initialize Results Containers ===
     all_runs_fmodgwo = []
@@ -94,9 +116,15 @@ def main():
             pop_size=pop_size,
             archive_size=archive_size,
             node_to_comm=node_to_comm,
-            total_communities=total_communities
+            total_communities=total_communities,
+            evaluator=make_evaluator()
         )
-        archive, archive_costs_history, hv_values, times = optimizer.optimize(max_iter)
+        checkpoint_path = os.path.join(checkpoint_dir, f'communityStratifiedFMODGWO_run{run_idx + 1}.pkl')
+        with HistorySink(os.path.join(history_dir, f'communityStratifiedFMODGWO_run{run_idx + 1}'),
+                         window=history_window) as history:
+            archive, archive_costs_history, hv_values, times = optimizer.optimize(
+                max_iter, checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
+                resume=checkpoint_path if resume_runs and is_resumable(checkpoint_path) else None, history=history)
 
         # Use a clean per-run dictionary
         run_result = {
@@ -112,7 +140,8 @@ def main():
         print(f"✅ Run {run_idx + 1} complete. Final HV: {hv_values[-1]:.4f}")
 
         # --- 多目标算法2: MODBA ---
-        optimizer_modba = MODBA(graph, budget, pop_size, archive_size, node_to_comm, total_communities)
+        optimizer_modba = MODBA(graph, budget, pop_size, archive_size, node_to_comm, total_communities,
+                                evaluator=make_evaluator())
         archive, all_solutions, hv_values, times = optimizer_modba.optimize(max_iter)
 
         run_result_modba = {
@@ -124,7 +153,8 @@ def main():
         all_runs_modba.append(run_result_modba)
 
         # --- 多目标算法3: MODPSO ---
-        optimizer_modpso = MODPSO(graph, budget, pop_size, archive_size, node_to_comm, total_communities)
+        optimizer_modpso = MODPSO(graph, budget, pop_size, archive_size, node_to_comm, total_communities,
+                                  evaluator=make_evaluator())
         all_solutions, hv_values = optimizer_modpso.optimize(max_iter)
         archive = all_solutions[0][0]
         times = all_solutions[0][1]
@@ -138,7 +168,7 @@ def main():
         all_runs_modpso.append(run_result_modpso)
 
         # --- 单目标基线: CELF ---
-        celf_solutions = CELF.CELF_seed_selection(graph, budget, node_to_comm, total_communities)
+        celf_solutions = CELF.CELF_seed_selection(graph, budget, node_to_comm, total_communities, backend=celf_backend)
         all_runs_celf.append(celf_solutions)
         print("all_runs_celf = ", all_runs_celf)
 
@@ -158,12 +188,14 @@ def main():
         print("all_runs_pagerank = ",all_runs_pagerank)
         #
         # # --- 单目标基线: Closeness Centrality ---
-        closeness_solutions = ClosenessCentr.closeness_seed_selection(graph, budget, node_to_comm, total_communities)
+        closeness_solutions = ClosenessCentr.closeness_seed_selection(graph, budget, node_to_comm, total_communities,
+                                                                      k=centrality_pivots, workers=centrality_workers)
         all_runs_closeness.append(closeness_solutions)
         print("all_runs_closeness = ",all_runs_closeness)
         #
         # # --- 单目标基线: Betweenness Centrality ---
-        betweenness_solutions = betweennesscentr.betweenness_seed_selection(graph, budget, node_to_comm, total_communities)
+        betweenness_solutions = betweennesscentr.betweenness_seed_selection(graph, budget, node_to_comm, total_communities,
+                                                                            k=centrality_pivots, workers=centrality_workers)
         all_runs_betweenness.append(betweenness_solutions)
         print("all_runs_betweenness = ", all_runs_betweenness)
         #
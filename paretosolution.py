@@ -2,6 +2,10 @@
 
 
 import random
+import numpy as np
+from NonDominatedSort import non_dominated_sort
+from Hypervolume import hypervolume_2d
+from CrowdingDistance import crowding_order
 #这部分包含：帕累托支配比较,拥挤距离，筛选出种群中的帕累托最优解和精英继承解。
 
 def dominates(fitness1, fitness2):
@@ -43,25 +47,32 @@ def update_elite_archive(elite_archive, new_solutions, elite_size):
     确保精英存档不会超过定义的最大精英大小。
     """
     # Step 1: 批量添加新解并更新精英存档
-    for new_solution, new_fitness in new_solutions:
-        # 标记当前解是否应加入精英存档
-        to_add = True
-
-        # 检查新解是否支配现有存档中的解
-        elite_archive = [
-            (existing_solution, existing_fitness)
-            for existing_solution, existing_fitness in elite_archive
-            if not dominates(new_fitness, existing_fitness)
-        ]
-
-        # 检查新解是否被现有解支配
-        for _, existing_fitness in elite_archive:
-            if dominates(existing_fitness, new_fitness):
-                to_add = False
-                break
-
-        if to_add:
-            elite_archive.append((new_solution, new_fitness))
+    # 逐个插入的结果等价于 (存档 + 新解) 的第一层非支配解；双目标时用 O(N log N) 排序一次求出
+    # （列表、ndarray 形式的双目标适应度先转为 tuple，与 dominates 要求的格式一致）
+    candidates = list(elite_archive) + list(new_solutions)
+    if candidates and all(np.ndim(fitness) == 1 and len(fitness) == 2 for _, fitness in candidates):
+        candidates = [(solution, tuple(fitness)) for solution, fitness in candidates]
+        elite_archive = [candidates[i] for i in non_dominated_sort([fitness for _, fitness in candidates])[0]]
+    else:
+        for new_solution, new_fitness in new_solutions:
+            # 标记当前解是否应加入精英存档
+            to_add = True
+
+            # 检查新解是否支配现有存档中的解
+            elite_archive = [
+                (existing_solution, existing_fitness)
+                for existing_solution, existing_fitness in elite_archive
+                if not dominates(new_fitness, existing_fitness)
+            ]
+
+            # 检查新解是否被现有解支配
+            for _, existing_fitness in elite_archive:
+                if dominates(existing_fitness, new_fitness):
+                    to_add = False
+                    break
+
+            if to_add:
+                elite_archive.append((new_solution, new_fitness))
 
     # Step 2: 如果存档大小超过阈值，基于 crowding distance 策略进行裁剪
     if len(elite_archive) > elite_size:
@@ -91,55 +102,16 @@ def calculate_crowding_distance(archive):
     :param archive: [(solution, fitness)] 列表，每个 solution 有多个目标
     :return: 根据拥挤距离排序的 archive 列表 (从大到小)
     """
-    num_solutions = len(archive)
-    if num_solutions == 0:
+    if len(archive) == 0:
         return archive
 
-    # 初始化每个解的拥挤距离
-    distances = [0.0] * num_solutions
-    num_objectives = len(archive[0][1])  # 假设每个 solution 都有多个目标
-
-    # 针对每一个目标进行排序和计算
-    for obj_index in range(num_objectives):
-        # 根据当前目标对 archive 进行排序
-        archive.sort(key=lambda x: x[1][obj_index])
-
-        # 边界解的拥挤距离设为无穷大
-        distances[0] = float('inf')
-        distances[-1] = float('inf')
-
-        # 对中间的解计算拥挤距离
-        min_obj = archive[0][1][obj_index]
-        max_obj = archive[-1][1][obj_index]
-
-        # 避免除以零的问题，如果 min_obj == max_obj 说明所有解在这个目标上都相同
-        if max_obj - min_obj == 0:
-            continue
-
-        for i in range(1, num_solutions - 1):
-            # 归一化拥挤距离计算
-            distance = (archive[i + 1][1][obj_index] - archive[i - 1][1][obj_index]) / (max_obj - min_obj)
-            distances[i] += distance
-
-    # 根据累计的拥挤距离排序，从大到小
-    sorted_archive = [x for _, x in sorted(zip(distances, archive), key=lambda x: x[0], reverse=True)]
-
-    return sorted_archive
+    order = crowding_order([fitness for _, fitness in archive])
+    return [archive[i] for i in order]
 
 def calculate_hypervolume(archive, reference_point):
     """
     Accurate hypervolume calculation for two-objective maximization problems.
     """
-    # Extract fitnesses and sort by the first objective in descending order
-    fitnesses = sorted([fit for _, fit in archive], key=lambda x: x[0], reverse=True)
-    hv = 0.0
-    prev_f2 = reference_point[1]
-
-    for f1, f2 in fitnesses:
-        width = max(f1 - reference_point[0], 0)
-        height = max(f2 - prev_f2, 0)
-        hv += width * height
-        prev_f2 = f2
-
-    return hv
-
+    if hasattr(archive, 'hypervolume'):
+        return archive.hypervolume(reference_point)  # ParetoArchive 增量维护的 HV
+    return hypervolume_2d([fit for _, fit in archive], reference_point)
@@ -0,0 +1,44 @@
+import networkx as nx
+import numpy as np
+import pytest
+from StructureMetrics import StructureMetrics
+
+# scores_at / score / rank_nodes 与逐节点计算的对照：
+# 逐节点评分按原 compute_scores 的写法（_normalize 后逐个节点组合 degree / closeness），
+# t < transition_point * max_iter 时取 global 评分，之后取 local 评分。
+
+MAX_ITER = 100
+
+def reference_score(metrics, node, t, max_iter, transition_point):
+    deg_norm = metrics._normalize(metrics.degree)
+    clo_norm = metrics._normalize(metrics.closeness)
+    if t < transition_point * max_iter:
+        return 0.8 * deg_norm[node] + 0.2 * (1 - clo_norm[node])
+    return 0.5 * deg_norm[node] + 0.5 * clo_norm[node]
+
+@pytest.fixture(scope='module')
+def metrics():
+    return StructureMetrics(nx.convert_node_labels_to_integers(nx.les_miserables_graph()))
+
+@pytest.mark.parametrize('transition_point', [0.4, 0.6])
+@pytest.mark.parametrize('offset', [-60, -1, 0, 1, 39])
+def test_scores_at_matches_per_node_score(metrics, transition_point, offset):
+    t = min(max(int(transition_point * MAX_ITER) + offset, 0), MAX_ITER - 1)
+    scores = metrics.scores_at(t, MAX_ITER, transition_point)
+    for node in metrics.graph.nodes():
+        idx = metrics.csr.index_of[node]
+        expected = np.float32(reference_score(metrics, node, t, MAX_ITER, transition_point))
+        assert scores[idx] == expected
+        assert metrics.score(node, t, MAX_ITER, transition_point) == float(expected)
+
+@pytest.mark.parametrize('t', [0, 59, 60, 99])
+def test_rank_nodes_matches_per_node_sort(metrics, t):
+    nodes = list(metrics.graph.nodes())[::-1]
+    expected = sorted(nodes, key=lambda node: metrics.score(node, t, MAX_ITER), reverse=True)
+    assert metrics.rank_nodes(nodes, t, MAX_ITER) == expected
+
+def test_compute_scores_matches_per_node_formula(metrics):
+    score_global, score_local = metrics.compute_scores()
+    for node in metrics.graph.nodes():
+        assert score_global[node] == reference_score(metrics, node, 0, MAX_ITER, 0.6)
+        assert score_local[node] == reference_score(metrics, node, MAX_ITER, MAX_ITER, 0.6)
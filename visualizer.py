@@ -25,6 +25,10 @@ class Visualizer:
                 seed_set = getattr(sol, 'Position', [])
                 cost = getattr(sol, 'Cost', (None, None))
 
+            # Population 的 WolfView.Position 是 frozenset，转为普通集合，写出的格式与 GreyWolf.Position 相同
+            if isinstance(seed_set, frozenset):
+                seed_set = set(seed_set)
+
             parsed_results.append({
                 "Seed_Set": seed_set,
                 "Cost": cost